@@ -2,36 +2,69 @@ from django.contrib import admin
 from .models import Course, Exam, Grade, CourseGrade, ReportCard
 
 
+class ChangelistDeferMixin:
+    """
+    Defer the list_defer columns on the changelist only: the change form,
+    its deletion and the other admin views still load the whole row.
+    """
+    list_defer = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match is not None and (match.url_name or '').endswith('_changelist'):
+            queryset = queryset.defer(*self.list_defer)
+        return queryset
+
+
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ['code', 'name', 'program', 'course_type', 'credits', 'is_active']
     search_fields = ['code', 'name']
-    list_filter = ['program', 'course_type', 'is_active']
+    list_filter = [('program', admin.RelatedOnlyFieldListFilter), 'course_type', 'is_active']
+    list_select_related = ['program']
+    autocomplete_fields = ['program', 'level']
+    list_defer = ['description', 'program__description']
 
 
 @admin.register(Exam)
-class ExamAdmin(admin.ModelAdmin):
+class ExamAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ['course', 'exam_type', 'semester', 'date', 'start_time', 'classroom']
-    list_filter = ['exam_type', 'semester', 'date']
-    raw_id_fields = ['course']
+    list_filter = ['exam_type', 'semester']
+    date_hierarchy = 'date'
+    list_select_related = ['course', 'semester__academic_year', 'classroom']
+    raw_id_fields = ['course', 'semester', 'classroom']
+    show_full_result_count = False
+    list_defer = ['course__description']
 
 
 @admin.register(Grade)
-class GradeAdmin(admin.ModelAdmin):
+class GradeAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ['student', 'exam', 'score', 'is_absent', 'graded_by', 'graded_at']
-    list_filter = ['is_absent', 'graded_at']
-    raw_id_fields = ['student', 'exam']
+    list_filter = ['is_absent']
+    date_hierarchy = 'graded_at'
+    list_select_related = ['student__user', 'exam__course', 'graded_by']
+    raw_id_fields = ['student', 'exam', 'graded_by']
+    show_full_result_count = False
+    list_defer = ['remarks', 'exam__course__description', 'student__user__address', 'graded_by__address']
 
 
 @admin.register(CourseGrade)
-class CourseGradeAdmin(admin.ModelAdmin):
+class CourseGradeAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ['student', 'course', 'semester', 'final_score', 'grade_letter', 'is_validated']
     list_filter = ['semester', 'grade_letter', 'is_validated']
-    raw_id_fields = ['student', 'course']
+    list_select_related = ['student__user', 'course', 'semester__academic_year']
+    raw_id_fields = ['student', 'course', 'semester', 'validated_by']
+    show_full_result_count = False
+    list_defer = ['course__description', 'student__user__address']
 
 
 @admin.register(ReportCard)
-class ReportCardAdmin(admin.ModelAdmin):
+class ReportCardAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ['student', 'semester', 'gpa', 'total_credits', 'credits_earned', 'is_published']
     list_filter = ['semester', 'is_published']
-    raw_id_fields = ['student']
+    date_hierarchy = 'generated_at'
+    list_select_related = ['student__user', 'semester__academic_year']
+    raw_id_fields = ['student', 'semester', 'generated_by']
+    show_full_result_count = False
+    list_defer = ['remarks', 'courses_payload', 'student__user__address']
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:34
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+
+def backfill_grade_letter(apps, schema_editor):
+    CourseGrade = apps.get_model("academics", "CourseGrade")
+    CourseGrade.objects.update(
+        grade_letter=Case(
+            When(final_score__gte=16, then=Value("A")),
+            When(final_score__gte=14, then=Value("B")),
+            When(final_score__gte=12, then=Value("C")),
+            When(final_score__gte=10, then=Value("D")),
+            default=Value("F"),
+            output_field=models.CharField(max_length=2),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academics", "0003_alter_course_options_remove_course_semester_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_grade_letter, migrations.RunPython.noop),
+    ]
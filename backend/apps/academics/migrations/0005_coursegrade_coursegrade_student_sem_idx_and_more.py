@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_backfill_coursegrade_grade_letter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursegrade',
+            index=models.Index(fields=['student', 'semester'], include=('course', 'final_score'), name='coursegrade_student_sem_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['course', 'semester', 'date'], name='exam_course_semester_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['exam', 'student'], name='grade_exam_student_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_coursegrade_coursegrade_student_sem_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='coursegrade',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='grade',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='coursegrade',
+            constraint=models.UniqueConstraint(fields=('student', 'course', 'semester'), name='uniq_coursegrade_scs'),
+        ),
+        migrations.AddConstraint(
+            model_name='grade',
+            constraint=models.UniqueConstraint(fields=('student', 'exam'), name='uniq_grade_student_exam'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_alter_coursegrade_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='coursegrade',
+            name='coursegrade_student_sem_idx',
+        ),
+        migrations.AddField(
+            model_name='coursegrade',
+            name='course_credits',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Crédits du cours'),
+        ),
+        migrations.AddIndex(
+            model_name='coursegrade',
+            index=models.Index(fields=['student', 'semester'], include=('course_credits', 'final_score'), name='coursegrade_student_sem_idx'),
+        ),
+    ]
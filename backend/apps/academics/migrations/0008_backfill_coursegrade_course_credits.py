@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:52
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_course_credits(apps, schema_editor):
+    Course = apps.get_model("academics", "Course")
+    CourseGrade = apps.get_model("academics", "CourseGrade")
+    CourseGrade.objects.update(
+        course_credits=Subquery(
+            Course.objects.filter(pk=OuterRef("course_id")).values("credits")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academics", "0007_remove_coursegrade_coursegrade_student_sem_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_course_credits, migrations.RunPython.noop),
+    ]
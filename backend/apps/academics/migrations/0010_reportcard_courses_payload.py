@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0009_grade_grade_graded_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportcard',
+            name='courses_payload',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Détail des cours (cache)'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0010_reportcard_courses_payload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reportcard',
+            index=models.Index(fields=['semester', 'gpa'], name='reportcard_semester_gpa_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0011_reportcard_semester_gpa_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='exam',
+            name='exam_course_semester_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='grade',
+            name='grade_exam_student_idx',
+        ),
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['course', 'semester', 'date'], include=('weight', 'max_score'), name='exam_course_semester_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['exam', 'student'], include=('score', 'is_absent'), name='grade_exam_student_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0012_exam_grade_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='grade',
+            name='grade_exam_student_idx',
+        ),
+        migrations.AddField(
+            model_name='grade',
+            name='normalized_score',
+            field=models.DecimalField(decimal_places=6, default=0, editable=False, max_digits=11, verbose_name='Note sur 20'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['exam', 'student'], include=('normalized_score',), name='grade_exam_student_idx'),
+        ),
+    ]
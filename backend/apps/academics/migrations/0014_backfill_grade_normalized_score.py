@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:25
+
+from decimal import Decimal
+
+from django.db import migrations
+
+SCORE_SCALE = Decimal("20.00")
+NORMALIZED_QUANTUM = Decimal("0.000001")
+BATCH_SIZE = 1000
+
+
+def backfill_normalized_score(apps, schema_editor):
+    Grade = apps.get_model("academics", "Grade")
+    batch = []
+    grades = Grade.objects.select_related("exam").only(
+        "id", "score", "is_absent", "exam__max_score"
+    )
+    for grade in grades.iterator(chunk_size=BATCH_SIZE):
+        max_score = grade.exam.max_score
+        if grade.is_absent:
+            grade.normalized_score = Decimal("0")
+        elif max_score and max_score > 0 and max_score != SCORE_SCALE:
+            grade.normalized_score = (
+                grade.score / max_score * SCORE_SCALE
+            ).quantize(NORMALIZED_QUANTUM)
+        else:
+            grade.normalized_score = grade.score
+        batch.append(grade)
+        if len(batch) == BATCH_SIZE:
+            Grade.objects.bulk_update(batch, ["normalized_score"])
+            batch = []
+    Grade.objects.bulk_update(batch, ["normalized_score"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academics", "0013_grade_normalized_score"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized_score, migrations.RunPython.noop),
+    ]
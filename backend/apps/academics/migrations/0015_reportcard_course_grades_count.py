@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0014_backfill_grade_normalized_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportcard',
+            name='course_grades_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de notes de cours'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:32
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_course_grades_count(apps, schema_editor):
+    CourseGrade = apps.get_model("academics", "CourseGrade")
+    ReportCard = apps.get_model("academics", "ReportCard")
+    counts = CourseGrade.objects.filter(
+        student=OuterRef("student"), semester=OuterRef("semester")
+    ).order_by().values("student").annotate(count=Count("pk")).values("count")
+    ReportCard.objects.update(course_grades_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academics", "0015_reportcard_course_grades_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_course_grades_count, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,41 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case, Count, Exists, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Mod, Round
+from django.db.models.lookups import Exact, GreaterThan
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+from bisect import bisect_right
 
+from apps.core.choices import ChoiceLabelsMixin
 
-class Course(models.Model):
+
+# Valeurs décimales partagées, construites une seule fois (Decimal est immuable)
+ZERO = Decimal('0.00')
+DEFAULT_COEFFICIENT = Decimal('1.0')
+DEFAULT_MAX_SCORE = Decimal('20.00')
+DEFAULT_WEIGHT = Decimal('1.00')
+# Barème sur lequel les notes d'examen sont ramenées
+SCORE_SCALE = Decimal('20.00')
+# Précision de la note ramenée sur 20 stockée sur Grade
+NORMALIZED_QUANTUM = Decimal('0.000001')
+
+
+def normalize_score(score, is_absent, max_score):
+    """
+    Note ramenée sur 20 : 0 pour un absent, la note brute si l'examen est
+    déjà sur 20 ou n'a pas de note maximale.
+    """
+    if is_absent:
+        return ZERO
+    if max_score and max_score > 0 and max_score != SCORE_SCALE:
+        return (score / max_score * SCORE_SCALE).quantize(NORMALIZED_QUANTUM)
+    return score
+
+
+class Course(ChoiceLabelsMixin, models.Model):
     """Cours/Matière."""
 
     class CourseType(models.TextChoices):
@@ -54,7 +85,7 @@ class Course(models.Model):
     coefficient = models.DecimalField(
         max_digits=3,
         decimal_places=1,
-        default=Decimal('1.0'),
+        default=DEFAULT_COEFFICIENT,
         verbose_name="Coefficient"
     )
     is_active = models.BooleanField(default=True, verbose_name="Actif")
@@ -74,7 +105,7 @@ class Course(models.Model):
         return self.hours_lecture + self.hours_practical + self.hours_tutorial
 
 
-class Exam(models.Model):
+class Exam(ChoiceLabelsMixin, models.Model):
     """Examen pour un cours."""
 
     class ExamType(models.TextChoices):
@@ -117,13 +148,13 @@ class Exam(models.Model):
     max_score = models.DecimalField(
         max_digits=5,
         decimal_places=2,
-        default=Decimal('20.00'),
+        default=DEFAULT_MAX_SCORE,
         verbose_name="Note maximale"
     )
     weight = models.DecimalField(
         max_digits=3,
         decimal_places=2,
-        default=Decimal('1.00'),
+        default=DEFAULT_WEIGHT,
         validators=[MinValueValidator(0), MaxValueValidator(1)],
         verbose_name="Poids"
     )
@@ -133,9 +164,109 @@ class Exam(models.Model):
         verbose_name = "Examen"
         verbose_name_plural = "Examens"
         ordering = ['date', 'start_time']
+        indexes = [
+            # Couvrant pour le calcul des moyennes de cours (PostgreSQL)
+            models.Index(
+                fields=['course', 'semester', 'date'],
+                include=['weight', 'max_score'],
+                name='exam_course_semester_date_idx'
+            ),
+        ]
+
+    # Champs dont dépendent les notes de cours des étudiants
+    GRADING_FIELDS = ('course', 'semester', 'weight', 'max_score')
 
     def __str__(self):
-        return f"{self.course} - {self.get_exam_type_display()} ({self.date})"
+        return f"{self.course} - {self.choice_label('exam_type')} ({self.date})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valeurs chargées, pour savoir si une sauvegarde change le calcul des notes
+        attnames = cls._grading_attnames()
+        instance._loaded_grading_values = {
+            attname: value
+            for attname, value in zip(field_names, values)
+            if attname in attnames.values()
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        loaded = getattr(self, '_loaded_grading_values', {})
+        for name, attname in self._grading_attnames().items():
+            if update_fields is None or name in update_fields or attname in update_fields:
+                loaded[attname] = getattr(self, attname)
+        self._loaded_grading_values = loaded
+
+    @classmethod
+    def _grading_attnames(cls):
+        return {name: cls._meta.get_field(name).attname for name in cls.GRADING_FIELDS}
+
+    def changed_grading_fields(self, update_fields=None):
+        """
+        Champs de calcul des notes qu'une sauvegarde (limitée à
+        `update_fields` le cas échéant) change par rapport aux valeurs
+        chargées. Une valeur non chargée compte comme changée.
+        """
+        loaded = getattr(self, '_loaded_grading_values', {})
+        return {
+            name
+            for name, attname in self._grading_attnames().items()
+            if (update_fields is None or name in update_fields or attname in update_fields)
+            and (attname not in loaded or getattr(self, attname) != loaded[attname])
+        }
+
+
+class GradeQuerySet(models.QuerySet):
+    def with_percentage(self):
+        """Annoter le pourcentage (score / note maximale) calculé en SQL."""
+        return self.annotate(
+            annotated_percentage=Case(
+                When(
+                    exam__max_score__gt=0,
+                    # SQLite range les décimaux entiers en INTEGER : sans
+                    # conversion, 7 * 100 / 30 donnerait une division entière.
+                    then=ExpressionWrapper(
+                        Cast('score', models.FloatField()) * 100 / F('exam__max_score'),
+                        output_field=models.DecimalField(max_digits=6, decimal_places=2)
+                    )
+                ),
+                default=Value(Decimal('0')),
+                output_field=models.DecimalField(max_digits=6, decimal_places=2)
+            )
+        )
+
+    def bulk_record(self, exam, rows, graded_by=None, batch_size=1000):
+        """
+        Enregistrer en lot les notes d'un examen (insertion ou mise à jour).
+        `rows` : itérable de tuples (student_id, score, is_absent, remarks).
+        Un seul INSERT ... ON CONFLICT par lot ; les signaux post_save ne
+        sont pas émis, l'appelant doit recalculer les notes de cours.
+        """
+        grades = [
+            self.model(
+                student_id=student_id,
+                exam=exam,
+                score=score,
+                is_absent=is_absent,
+                normalized_score=normalize_score(score, is_absent, exam.max_score),
+                remarks=remarks,
+                graded_by=graded_by
+            )
+            for student_id, score, is_absent, remarks in rows
+        ]
+        with transaction.atomic(using=self.db):
+            return self.bulk_create(
+                grades,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['student', 'exam'],
+                update_fields=[
+                    'score', 'is_absent', 'normalized_score', 'remarks', 'graded_by', 'updated_at'
+                ]
+            )
 
 
 class Grade(models.Model):
@@ -160,6 +291,14 @@ class Grade(models.Model):
     )
     remarks = models.TextField(blank=True, verbose_name="Remarques")
     is_absent = models.BooleanField(default=False, verbose_name="Absent")
+    # Note sur 20 calculée à l'écriture, pour agréger les moyennes sans division
+    normalized_score = models.DecimalField(
+        max_digits=11,
+        decimal_places=6,
+        default=0,
+        editable=False,
+        verbose_name="Note sur 20"
+    )
     graded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -170,22 +309,71 @@ class Grade(models.Model):
     graded_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GradeQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Note"
         verbose_name_plural = "Notes"
-        unique_together = ['student', 'exam']
         ordering = ['exam', 'student']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'exam'], name='uniq_grade_student_exam'),
+        ]
+        indexes = [
+            # Couvrant pour le calcul des moyennes de cours (PostgreSQL)
+            models.Index(
+                fields=['exam', 'student'],
+                include=['normalized_score'],
+                name='grade_exam_student_idx'
+            ),
+            models.Index(fields=['graded_at'], name='grade_graded_at_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.exam}: {self.score}"
 
+    def save(self, *args, **kwargs):
+        self.set_normalized_score()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'normalized_score'}
+        super().save(*args, **kwargs)
+
+    def set_normalized_score(self):
+        """Recalculer la note sur 20 stockée, pour les écritures en lot."""
+        self.normalized_score = normalize_score(self.score, self.is_absent, self.exam.max_score)
+
     @property
     def percentage(self):
+        # Valeur annotée par GradeQuerySet.with_percentage(), sans accès à l'examen
+        if hasattr(self, 'annotated_percentage'):
+            return self.annotated_percentage
         if self.exam.max_score > 0:
             return (self.score / self.exam.max_score) * 100
         return 0
 
 
+# Seuils des mentions (croissants) : _GRADE_LETTERS[i] s'applique au-dessus de
+# _GRADE_CUTOFFS[i - 1], ce qui permet une recherche dichotomique avec bisect.
+# En Decimal, comme les notes : une comparaison Decimal/int est plus lente
+_GRADE_CUTOFFS = tuple(Decimal(cutoff) for cutoff in (10, 12, 14, 16))
+_GRADE_LETTERS = ('F', 'D', 'C', 'B', 'A')
+
+# Mention calculée côté base, pour les écritures qui ne passent pas par save()
+GRADE_LETTER_CASE = Case(
+    *[
+        When(final_score__gte=cutoff, then=Value(letter))
+        for cutoff, letter in reversed(list(zip(_GRADE_CUTOFFS, _GRADE_LETTERS[1:])))
+    ],
+    default=Value(_GRADE_LETTERS[0]),
+    output_field=models.CharField(max_length=2),
+)
+
+
+def grade_letter_for(final_score):
+    """Mention correspondant à une note finale sur 20."""
+    return _GRADE_LETTERS[bisect_right(_GRADE_CUTOFFS, final_score)]
+
+
 class CourseGrade(models.Model):
     """Note finale d'un étudiant pour un cours dans un semestre."""
     student = models.ForeignKey(
@@ -217,6 +405,12 @@ class CourseGrade(models.Model):
         blank=True,
         verbose_name="Mention"
     )
+    # Copie de course.credits, pour calculer les moyennes sans jointure
+    course_credits = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Crédits du cours"
+    )
     is_validated = models.BooleanField(default=False, verbose_name="Validé")
     validated_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -233,24 +427,58 @@ class CourseGrade(models.Model):
     class Meta:
         verbose_name = "Note de cours"
         verbose_name_plural = "Notes de cours"
-        unique_together = ['student', 'course', 'semester']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'course', 'semester'], name='uniq_coursegrade_scs'),
+        ]
+        indexes = [
+            # Index couvrant pour le calcul des moyennes (PostgreSQL)
+            models.Index(
+                fields=['student', 'semester'],
+                include=['course_credits', 'final_score'],
+                name='coursegrade_student_sem_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.course}: {self.final_score}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Cours chargé, pour ne relire ses crédits que s'il change
+        if 'course_id' in field_names:
+            instance._loaded_course_id = values[field_names.index('course_id')]
+        return instance
+
     def save(self, *args, **kwargs):
         # Calculate letter grade
-        if self.final_score >= 16:
-            self.grade_letter = 'A'
-        elif self.final_score >= 14:
-            self.grade_letter = 'B'
-        elif self.final_score >= 12:
-            self.grade_letter = 'C'
-        elif self.final_score >= 10:
-            self.grade_letter = 'D'
-        else:
-            self.grade_letter = 'F'
+        self.grade_letter = grade_letter_for(self.final_score)
+        # Crédits copiés à la création ou au changement de cours ; ensuite,
+        # sync_course_credits_on_course_change les tient à jour
+        if self._state.adding or self.course_id != getattr(self, '_loaded_course_id', None):
+            self.course_credits = self.course.credits
         super().save(*args, **kwargs)
+        self._loaded_course_id = self.course_id
+
+
+# Précision de la moyenne stockée (DecimalField à 2 décimales)
+GPA_QUANTUM = Decimal('0.01')
+
+# Taille des lots pour les recalculs de bulletins (bulk_create / bulk_update)
+RECALCULATION_BATCH_SIZE = 1000
+
+
+def gpa_aggregates():
+    """
+    Agrégats SQL (somme pondérée, crédits totaux, crédits obtenus, nombre de
+    notes de cours) d'un bulletin.
+    """
+    return {
+        'count': Count('pk'),
+        'weighted': Sum(F('course_credits') * F('final_score')),
+        'total': Sum('course_credits'),
+        'earned': Sum('course_credits', filter=Q(final_score__gte=10)),
+    }
 
 
 class ReportCard(models.Model):
@@ -270,13 +498,28 @@ class ReportCard(models.Model):
     gpa = models.DecimalField(
         max_digits=4,
         decimal_places=2,
-        default=Decimal('0.00'),
+        default=ZERO,
         verbose_name="Moyenne générale"
     )
     total_credits = models.PositiveIntegerField(default=0, verbose_name="Crédits totaux")
     credits_earned = models.PositiveIntegerField(default=0, verbose_name="Crédits obtenus")
     rank = models.PositiveIntegerField(null=True, blank=True, verbose_name="Rang")
     remarks = models.TextField(blank=True, verbose_name="Observations")
+    # Nombre de notes de cours du semestre, tenu à jour avec les moyennes
+    course_grades_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Nombre de notes de cours"
+    )
+    # Détail des cours rendu à la publication du bulletin (et au recalcul de
+    # sa moyenne), vidé dès qu'une note de cours du semestre (ou un cours)
+    # change : le détail est alors calculé à chaque lecture
+    courses_payload = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Détail des cours (cache)"
+    )
     is_published = models.BooleanField(default=False, verbose_name="Publié")
     published_at = models.DateTimeField(null=True, blank=True)
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -293,29 +536,165 @@ class ReportCard(models.Model):
         verbose_name_plural = "Bulletins de notes"
         unique_together = ['student', 'semester']
         ordering = ['-semester', 'student']
+        indexes = [
+            models.Index(fields=['semester', 'gpa'], name='reportcard_semester_gpa_idx'),
+        ]
 
     def __str__(self):
         return f"Bulletin - {self.student} ({self.semester})"
 
+    def save(self, *args, **kwargs):
+        # Les notes de cours peuvent exister avant le bulletin
+        if self._state.adding:
+            self.course_grades_count = CourseGrade.objects.filter(
+                student_id=self.student_id,
+                semester_id=self.semester_id
+            ).count()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def invalidate_courses_payload(cls, semester_ids):
+        """Vider le détail des cours mis en cache des bulletins de ces semestres."""
+        return cls.objects.filter(
+            semester_id__in=semester_ids,
+            courses_payload__isnull=False
+        ).update(courses_payload=None)
+
+    def _apply_totals(self, totals):
+        """
+        Reporter les agrégats de gpa_aggregates() (None : aucune note de
+        cours) sur le bulletin. Retourne True s'il y a quelque chose à
+        enregistrer ; sans crédits, la moyenne est laissée telle quelle.
+        """
+        count = totals['count'] if totals else 0
+        recounted = count != self.course_grades_count
+        self.course_grades_count = count
+        if totals and totals['total']:
+            # La somme pondérée est exacte en centièmes (notes à 2 décimales,
+            # crédits entiers) : on la ramène à un entier avant la division.
+            weighted_hundredths = int((Decimal(totals['weighted']) * 100).to_integral_value(ROUND_HALF_UP))
+            # Arrondi à égalité vers le pair, comme le DecimalField de la moyenne
+            self.gpa = (
+                Decimal(weighted_hundredths) / (totals['total'] * 100)
+            ).quantize(GPA_QUANTUM, rounding=ROUND_HALF_EVEN)
+            self.total_credits = totals['total']
+            self.credits_earned = totals['earned'] or 0
+            return True
+        return recounted
+
     def calculate_gpa(self):
         """Calculer la moyenne pondérée."""
-        course_grades = CourseGrade.objects.filter(
+        totals = CourseGrade.objects.filter(
             student=self.student,
             semester=self.semester
-        ).select_related('course')
+        ).aggregate(**gpa_aggregates())
+
+        self._apply_totals(totals)
+        self.save(update_fields=['gpa', 'total_credits', 'credits_earned', 'course_grades_count'])
+
+    @classmethod
+    def recalculate_for_semester(cls, semester, student_ids=None):
+        """
+        Recalculer en lot les moyennes des bulletins d'un semestre.
+        Un seul UPDATE, chaque bulletin étant recalculé par des sous-requêtes
+        corrélées sur ses notes de cours ; aucune ligne ne transite par Python.
+        Les bulletins sans crédits sont seulement recomptés : leur moyenne est
+        laissée telle quelle.
+        Retourne le nombre de bulletins mis à jour.
+        """
+        report_cards = cls.objects.filter(semester=semester)
+        if student_ids is not None:
+            report_cards = report_cards.filter(student_id__in=student_ids)
+
+        course_grades = CourseGrade.objects.filter(
+            student=OuterRef('student'),
+            semester=OuterRef('semester')
+        ).order_by().values('student')
+
+        def column(expression):
+            return Subquery(course_grades.annotate(value=expression).values('value'))
 
-        total_weighted_score = Decimal('0.00')
-        total_credits = 0
+        has_credits = Exists(course_grades.filter(course_credits__gt=0))
 
-        for cg in course_grades:
-            credits = cg.course.credits
-            total_weighted_score += cg.final_score * credits
-            total_credits += credits
+        def unless_no_credits(field_name, expression):
+            return Case(When(has_credits, then=expression), default=F(field_name))
+
+        # Somme pondérée en centièmes entiers (notes à 2 décimales) : le calcul
+        # reste exact même là où la base stocke les décimaux en flottants
+        weighted = Sum(
+            Cast(Round(F('final_score') * 100), models.IntegerField()) * F('course_credits')
+        )
+        total = Sum('course_credits')
+        # Arrondi au centième, à égalité vers le pair comme calculate_gpa :
+        # q = W div T, plus 1 si le reste r dépasse T / 2, ou l'égale et q est impair
+        quotient = ExpressionWrapper(weighted / total, output_field=models.IntegerField())
+        twice_remainder = (weighted - quotient * total) * 2
+        gpa_hundredths = ExpressionWrapper(
+            quotient + Case(
+                When(GreaterThan(twice_remainder, total), then=1),
+                When(Exact(twice_remainder, total) & Exact(Mod(quotient, 2), 1), then=1),
+                default=0
+            ),
+            output_field=models.IntegerField()
+        )
+
+        return report_cards.update(
+            course_grades_count=Coalesce(column(Count('pk')), 0),
+            gpa=unless_no_credits('gpa', column(ExpressionWrapper(
+                gpa_hundredths / Value(100.0),
+                output_field=models.DecimalField(max_digits=4, decimal_places=2)
+            ))),
+            total_credits=unless_no_credits('total_credits', column(total)),
+            credits_earned=unless_no_credits('credits_earned', Coalesce(
+                column(Sum('course_credits', filter=Q(final_score__gte=10))),
+                0
+            ))
+        )
+
+    @classmethod
+    def recalculate_for_students(cls, pairs):
+        """
+        Recalculer les bulletins des couples (student_id, semester_id) donnés.
+        Une seule requête groupée par (étudiant, semestre), puis un bulk_update.
+        Un bulletin dont toutes les notes de cours ont été supprimées est
+        seulement recompté.
+        Retourne le nombre de bulletins mis à jour.
+        """
+        pairs = set(pairs)
+        if not pairs:
+            return 0
+        student_ids = {student_id for student_id, _ in pairs}
+        semester_ids = {semester_id for _, semester_id in pairs}
+
+        totals_by_pair = {
+            (row['student'], row['semester']): row
+            for row in CourseGrade.objects.filter(
+                student_id__in=student_ids,
+                semester_id__in=semester_ids
+            ).values('student', 'semester').annotate(
+                **gpa_aggregates()
+            ).order_by()
+        }
+
+        report_cards = [
+            report_card
+            for report_card in cls.objects.filter(
+                student_id__in=student_ids,
+                semester_id__in=semester_ids
+            ).only(
+                'id', 'student', 'semester', 'gpa', 'total_credits',
+                'credits_earned', 'course_grades_count'
+            )
+            if (report_card.student_id, report_card.semester_id) in pairs
+            and report_card._apply_totals(
+                totals_by_pair.get((report_card.student_id, report_card.semester_id))
+            )
+        ]
 
-        if total_credits > 0:
-            self.gpa = total_weighted_score / total_credits
-            self.total_credits = total_credits
-            self.credits_earned = sum(
-                cg.course.credits for cg in course_grades if cg.final_score >= 10
+        with transaction.atomic():
+            cls.objects.bulk_update(
+                report_cards,
+                ['gpa', 'total_credits', 'credits_earned', 'course_grades_count'],
+                batch_size=RECALCULATION_BATCH_SIZE
             )
-        self.save()
+        return len(report_cards)
@@ -1,22 +1,40 @@
+import json
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
 from rest_framework import serializers
-from decimal import Decimal
-from .models import Course, Exam, Grade, CourseGrade, ReportCard
+from rest_framework.utils.encoders import JSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, Max, Min, Q
+from apps.core.fields import ChoiceDisplayField
+from apps.core.serializers import CachedFieldsMixin
+from apps.university.models import Level, Semester
+from .models import (
+    Course, Exam, Grade, CourseGrade, ReportCard,
+    DEFAULT_COEFFICIENT, DEFAULT_MAX_SCORE, DEFAULT_WEIGHT, ZERO
+)
+
+
+# Choice labels, built once instead of on every get_FOO_display() call
+COURSE_TYPE_LABELS = Course.choice_labels()['course_type']
+COURSE_SEMESTER_TYPE_LABELS = Course.choice_labels()['semester_type']
+EXAM_TYPE_LABELS = Exam.choice_labels()['exam_type']
+SEMESTER_TYPE_LABELS = Semester.choice_labels()['semester_type']
+LEVEL_LABELS = Level.choice_labels()['name']
+
+# Columns read by User.get_full_name(), for Meta.property_fields
+FULL_NAME_COLUMNS = ('first_name', 'last_name')
 
 
 # Course Serializers
-class CourseListSerializer(serializers.ModelSerializer):
+class CourseListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """List serializer for Course with basic fields."""
     program_name = serializers.CharField(source='program.name', read_only=True)
     program_code = serializers.CharField(source='program.code', read_only=True)
-    course_type_display = serializers.CharField(
-        source='get_course_type_display', read_only=True
-    )
-    semester_type_display = serializers.CharField(
-        source='get_semester_type_display', read_only=True
-    )
-    level_display = serializers.CharField(
-        source='level.get_name_display', read_only=True
-    )
+    course_type_display = ChoiceDisplayField(COURSE_TYPE_LABELS, source='course_type')
+    semester_type_display = ChoiceDisplayField(COURSE_SEMESTER_TYPE_LABELS, source='semester_type')
+    level_display = ChoiceDisplayField(LEVEL_LABELS, source='level.name')
     total_hours = serializers.IntegerField(read_only=True)
     
     class Meta:
@@ -27,9 +45,13 @@ class CourseListSerializer(serializers.ModelSerializer):
             'semester_type', 'semester_type_display', 'level', 'level_display',
             'total_hours', 'is_active'
         ]
+        select_related = ('program', 'level')
+        property_fields = {
+            'total_hours': ('hours_lecture', 'hours_practical', 'hours_tutorial')
+        }
 
 
-class CourseDetailSerializer(serializers.ModelSerializer):
+class CourseDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Detail serializer for Course with all fields and computed properties."""
     program_name = serializers.CharField(source='program.name', read_only=True)
     program_code = serializers.CharField(source='program.code', read_only=True)
@@ -39,15 +61,9 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     faculty_name = serializers.CharField(
         source='program.department.faculty.name', read_only=True
     )
-    course_type_display = serializers.CharField(
-        source='get_course_type_display', read_only=True
-    )
-    semester_type_display = serializers.CharField(
-        source='get_semester_type_display', read_only=True
-    )
-    level_display = serializers.CharField(
-        source='level.get_name_display', read_only=True
-    )
+    course_type_display = ChoiceDisplayField(COURSE_TYPE_LABELS, source='course_type')
+    semester_type_display = ChoiceDisplayField(COURSE_SEMESTER_TYPE_LABELS, source='semester_type')
+    level_display = ChoiceDisplayField(LEVEL_LABELS, source='level.name')
     total_hours = serializers.IntegerField(read_only=True)
     exams_count = serializers.SerializerMethodField()
     students_count = serializers.SerializerMethodField()
@@ -55,19 +71,45 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Course
-        fields = '__all__'
+        fields = [
+            'id', 'program_name', 'program_code', 'department_name',
+            'faculty_name', 'course_type_display', 'semester_type_display',
+            'level_display', 'total_hours', 'exams_count', 'students_count',
+            'prerequisites_count', 'name', 'code', 'course_type', 'credits',
+            'hours_lecture', 'hours_practical', 'hours_tutorial', 'description',
+            'semester_type', 'coefficient', 'is_active', 'created_at',
+            'updated_at', 'program', 'level', 'prerequisites'
+        ]
+        select_related = ('program__department__faculty', 'level')
+        prefetch_related = ('prerequisites',)
+        annotations = {
+            'annotated_exams_count': Count('exams', distinct=True),
+            'annotated_students_count': Count(
+                'program__students',
+                filter=Q(program__students__status='ACTIVE'),
+                distinct=True
+            ),
+            'annotated_prerequisites_count': Count('prerequisites', distinct=True),
+        }
     
+    # Counts are annotated by the viewset queryset; fall back to a query otherwise
     def get_exams_count(self, obj):
+        if hasattr(obj, 'annotated_exams_count'):
+            return obj.annotated_exams_count
         return obj.exams.count()
     
     def get_students_count(self, obj):
+        if hasattr(obj, 'annotated_students_count'):
+            return obj.annotated_students_count
         return obj.program.students.filter(status='ACTIVE').count()
     
     def get_prerequisites_count(self, obj):
+        if hasattr(obj, 'annotated_prerequisites_count'):
+            return obj.annotated_prerequisites_count
         return obj.prerequisites.count()
 
 
-class CourseCreateSerializer(serializers.ModelSerializer):
+class CourseCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Create serializer for Course with validation."""
     
     class Meta:
@@ -78,18 +120,10 @@ class CourseCreateSerializer(serializers.ModelSerializer):
             'prerequisites', 'semester_type', 'level', 'is_active'
         ]
     
-    def validate_code(self, value):
-        """Validate that course code is unique."""
-        if Course.objects.filter(code=value).exists():
-            raise serializers.ValidationError(
-                "Un cours avec ce code existe déjà."
-            )
-        return value
-    
     def validate(self, attrs):
         """Validate course constraints."""
         credits = attrs.get('credits', 0)
-        coefficient = attrs.get('coefficient', Decimal('1.0'))
+        coefficient = attrs.get('coefficient', DEFAULT_COEFFICIENT)
         
         # Validate positive values
         if credits <= 0:
@@ -106,16 +140,12 @@ class CourseCreateSerializer(serializers.ModelSerializer):
 
 
 # Exam Serializers
-class ExamListSerializer(serializers.ModelSerializer):
+class ExamListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """List serializer for Exam with basic fields."""
     course_name = serializers.CharField(source='course.name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
-    exam_type_display = serializers.CharField(
-        source='get_exam_type_display', read_only=True
-    )
-    semester_name = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    exam_type_display = ChoiceDisplayField(EXAM_TYPE_LABELS, source='exam_type')
+    semester_name = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
     classroom_name = serializers.CharField(
         source='classroom.name', read_only=True
     )
@@ -128,21 +158,18 @@ class ExamListSerializer(serializers.ModelSerializer):
             'start_time', 'end_time', 'classroom', 'classroom_name',
             'max_score', 'weight'
         ]
+        select_related = ('course', 'semester', 'classroom')
 
 
-class ExamDetailSerializer(serializers.ModelSerializer):
+class ExamDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Detail serializer for Exam with all fields and computed properties."""
     course_name = serializers.CharField(source='course.name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
     program_name = serializers.CharField(
         source='course.program.name', read_only=True
     )
-    exam_type_display = serializers.CharField(
-        source='get_exam_type_display', read_only=True
-    )
-    semester_name = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    exam_type_display = ChoiceDisplayField(EXAM_TYPE_LABELS, source='exam_type')
+    semester_name = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
     academic_year = serializers.CharField(
         source='semester.academic_year.name', read_only=True
     )
@@ -156,13 +183,23 @@ class ExamDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Exam
-        fields = '__all__'
+        fields = [
+            'id', 'course_name', 'course_code', 'program_name',
+            'exam_type_display', 'semester_name', 'academic_year',
+            'classroom_name', 'classroom_capacity', 'grades_count', 'exam_type',
+            'date', 'start_time', 'end_time', 'max_score', 'weight', 'created_at',
+            'course', 'semester', 'classroom'
+        ]
+        select_related = ('course__program', 'semester__academic_year', 'classroom')
+        annotations = {'annotated_grades_count': Count('grades', distinct=True)}
     
     def get_grades_count(self, obj):
+        if hasattr(obj, 'annotated_grades_count'):
+            return obj.annotated_grades_count
         return obj.grades.count()
 
 
-class ExamCreateSerializer(serializers.ModelSerializer):
+class ExamCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Create serializer for Exam with validation."""
     
     class Meta:
@@ -178,8 +215,8 @@ class ExamCreateSerializer(serializers.ModelSerializer):
         end_time = attrs.get('end_time')
         date = attrs.get('date')
         semester = attrs.get('semester')
-        max_score = attrs.get('max_score', Decimal('20.00'))
-        weight = attrs.get('weight', Decimal('1.00'))
+        max_score = attrs.get('max_score', DEFAULT_MAX_SCORE)
+        weight = attrs.get('weight', DEFAULT_WEIGHT)
         
         # Validate start_time is before end_time
         if start_time and end_time and start_time >= end_time:
@@ -209,7 +246,7 @@ class ExamCreateSerializer(serializers.ModelSerializer):
 
 
 # Grade Serializers
-class GradeListSerializer(serializers.ModelSerializer):
+class GradeListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """List serializer for Grade with basic fields."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -220,9 +257,7 @@ class GradeListSerializer(serializers.ModelSerializer):
     exam_info = serializers.CharField(source='exam.__str__', read_only=True)
     course_name = serializers.CharField(source='exam.course.name', read_only=True)
     course_code = serializers.CharField(source='exam.course.code', read_only=True)
-    exam_type_display = serializers.CharField(
-        source='exam.get_exam_type_display', read_only=True
-    )
+    exam_type_display = ChoiceDisplayField(EXAM_TYPE_LABELS, source='exam.exam_type')
     graded_by_name = serializers.CharField(
         source='graded_by.get_full_name', read_only=True
     )
@@ -238,9 +273,11 @@ class GradeListSerializer(serializers.ModelSerializer):
             'score', 'percentage', 'is_absent', 'graded_by', 'graded_by_name',
             'graded_at'
         ]
+        select_related = ('student__user', 'exam__course', 'graded_by')
+        property_fields = {'percentage': ('score', 'exam')}
 
 
-class GradeDetailSerializer(serializers.ModelSerializer):
+class GradeDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Detail serializer for Grade with all fields and computed properties."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -254,9 +291,7 @@ class GradeDetailSerializer(serializers.ModelSerializer):
     exam_name = serializers.CharField(source='exam.__str__', read_only=True)
     course_name = serializers.CharField(source='exam.course.name', read_only=True)
     course_code = serializers.CharField(source='exam.course.code', read_only=True)
-    exam_type_display = serializers.CharField(
-        source='exam.get_exam_type_display', read_only=True
-    )
+    exam_type_display = ChoiceDisplayField(EXAM_TYPE_LABELS, source='exam.exam_type')
     exam_date = serializers.DateField(source='exam.date', read_only=True)
     exam_max_score = serializers.DecimalField(
         source='exam.max_score', max_digits=5, decimal_places=2, read_only=True
@@ -273,18 +308,73 @@ class GradeDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Grade
-        fields = '__all__'
-
-
-class GradeCreateSerializer(serializers.ModelSerializer):
+        fields = [
+            'id', 'student_name', 'student_matricule', 'student_program',
+            'exam_name', 'course_name', 'course_code', 'exam_type_display',
+            'exam_date', 'exam_max_score', 'exam_weight', 'graded_by_name',
+            'percentage', 'score', 'remarks', 'is_absent', 'graded_at',
+            'updated_at', 'student', 'exam', 'graded_by'
+        ]
+        select_related = ('student__user', 'student__program', 'exam__course', 'graded_by')
+
+
+class UniqueConstraintErrorMixin:
+    """
+    Rely on the database unique constraint instead of an existence query:
+    a violation of duplicate_constraint on save is reported as a validation
+    error. Any other integrity error is re-raised.
+    """
+    duplicate_error = None
+    duplicate_constraint = None
+
+    def _is_duplicate(self, validated_data, instance=None):
+        """Whether another row already holds the duplicate_constraint fields."""
+        model = self.Meta.model
+        constraint = next(
+            constraint for constraint in model._meta.constraints
+            if constraint.name == self.duplicate_constraint
+        )
+        lookup = {
+            name: validated_data[name] if name in validated_data else getattr(instance, name)
+            for name in constraint.fields
+        }
+        duplicates = model._default_manager.filter(**lookup)
+        if instance is not None:
+            duplicates = duplicates.exclude(pk=instance.pk)
+        return duplicates.exists()
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not self._is_duplicate(validated_data):
+                raise
+            raise serializers.ValidationError(self.duplicate_error)
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            if not self._is_duplicate(validated_data, instance):
+                raise
+            raise serializers.ValidationError(self.duplicate_error)
+
+
+class GradeCreateSerializer(UniqueConstraintErrorMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """Create serializer for Grade with validation."""
+    duplicate_error = {
+        "student": "Une note existe déjà pour cet étudiant et cet examen."
+    }
+    duplicate_constraint = 'uniq_grade_student_exam'
     
     class Meta:
         model = Grade
         fields = [
             'student', 'exam', 'score', 'remarks', 'is_absent', 'graded_by'
         ]
-        # Remove default unique_together validator to use custom validation
+        # Duplicates are rejected by duplicate_constraint on save
         validators = []
     
     def validate(self, attrs):
@@ -293,16 +383,12 @@ class GradeCreateSerializer(serializers.ModelSerializer):
         exam = attrs.get('exam')
         if not exam and self.instance:
             exam = self.instance.exam
-            
-        student = attrs.get('student')
-        if not student and self.instance:
-             student = self.instance.student
              
         score = attrs.get('score')
         if score is None and self.instance:
             score = self.instance.score
         elif score is None:
-            score = Decimal('0.00')
+            score = ZERO
 
         is_absent = attrs.get('is_absent')
         if is_absent is None and self.instance:
@@ -318,17 +404,9 @@ class GradeCreateSerializer(serializers.ModelSerializer):
             # Existing code sets attrs['score'] = 0.
             # Only if is_absent became True or was True.
             # If user sends score=15, is_absent=True -> score becomes 0.
-            score = Decimal('0.00')
+            score = ZERO
             attrs['score'] = score
         
-        # Check for duplicate grade
-        # Only check on Create. If Updating, strict unique check exists on model but we can skip custom check.
-        if student and exam and not self.instance:
-             if Grade.objects.filter(student=student, exam=exam).exists():
-                raise serializers.ValidationError({
-                    "student": "Une note existe déjà pour cet étudiant et cet examen."
-                })
-        
         # Validate score doesn't exceed max_score
         if exam and score > exam.max_score:
             raise serializers.ValidationError({
@@ -339,7 +417,7 @@ class GradeCreateSerializer(serializers.ModelSerializer):
 
 
 # CourseGrade Serializers
-class CourseGradeListSerializer(serializers.ModelSerializer):
+class CourseGradeListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """List serializer for CourseGrade with basic fields."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -349,9 +427,7 @@ class CourseGradeListSerializer(serializers.ModelSerializer):
     )
     course_name = serializers.CharField(source='course.name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
-    semester_name = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    semester_name = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
     validated_by_name = serializers.CharField(
         source='validated_by.get_full_name', read_only=True
     )
@@ -364,9 +440,14 @@ class CourseGradeListSerializer(serializers.ModelSerializer):
             'final_score', 'grade_letter', 'is_validated', 'validated_by',
             'validated_by_name', 'validated_at'
         ]
+        select_related = ('student__user', 'course', 'semester', 'validated_by')
+        property_fields = {
+            'student.user.get_full_name': FULL_NAME_COLUMNS,
+            'validated_by.get_full_name': FULL_NAME_COLUMNS,
+        }
 
 
-class CourseGradeDetailSerializer(serializers.ModelSerializer):
+class CourseGradeDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Detail serializer for CourseGrade with all fields and computed properties."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -383,9 +464,7 @@ class CourseGradeDetailSerializer(serializers.ModelSerializer):
     course_coefficient = serializers.DecimalField(
         source='course.coefficient', max_digits=3, decimal_places=1, read_only=True
     )
-    semester_name = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    semester_name = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
     academic_year = serializers.CharField(
         source='semester.academic_year.name', read_only=True
     )
@@ -395,11 +474,29 @@ class CourseGradeDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CourseGrade
-        fields = '__all__'
+        fields = [
+            'id', 'student_name', 'student_matricule', 'student_program',
+            'course_name', 'course_code', 'course_credits', 'course_coefficient',
+            'semester_name', 'academic_year', 'validated_by_name', 'final_score',
+            'grade_letter', 'is_validated', 'validated_at', 'created_at',
+            'updated_at', 'student', 'course', 'semester', 'validated_by'
+        ]
+        select_related = (
+            'student__user', 'student__program', 'course',
+            'semester__academic_year', 'validated_by'
+        )
+        property_fields = {
+            'student.user.get_full_name': FULL_NAME_COLUMNS,
+            'validated_by.get_full_name': FULL_NAME_COLUMNS,
+        }
 
 
-class CourseGradeCreateSerializer(serializers.ModelSerializer):
+class CourseGradeCreateSerializer(UniqueConstraintErrorMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """Create serializer for CourseGrade with validation."""
+    duplicate_error = {
+        "student": "Une note de cours existe déjà pour cet étudiant, ce cours et ce semestre."
+    }
+    duplicate_constraint = 'uniq_coursegrade_scs'
     
     class Meta:
         model = CourseGrade
@@ -407,24 +504,12 @@ class CourseGradeCreateSerializer(serializers.ModelSerializer):
             'student', 'course', 'semester', 'final_score', 'is_validated',
             'validated_by'
         ]
-        # Remove default unique_together validator to use custom validation
+        # Duplicates are rejected by duplicate_constraint on save
         validators = []
     
     def validate(self, attrs):
         """Validate course grade constraints."""
-        student = attrs.get('student')
-        course = attrs.get('course')
-        semester = attrs.get('semester')
-        final_score = attrs.get('final_score', Decimal('0.00'))
-        
-        # Check for duplicate course grade
-        if student and course and semester:
-            # Only check for duplicates on create (when instance is None)
-            if not self.instance:
-                if CourseGrade.objects.filter(student=student, course=course, semester=semester).exists():
-                    raise serializers.ValidationError({
-                        "student": "Une note de cours existe déjà pour cet étudiant, ce cours et ce semestre."
-                    })
+        final_score = attrs.get('final_score', ZERO)
         
         # Validate final_score is between 0 and 20
         if final_score < 0 or final_score > 20:
@@ -436,7 +521,7 @@ class CourseGradeCreateSerializer(serializers.ModelSerializer):
 
 
 # ReportCard Serializers
-class ReportCardListSerializer(serializers.ModelSerializer):
+class ReportCardListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """List serializer for ReportCard with basic fields."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -447,9 +532,7 @@ class ReportCardListSerializer(serializers.ModelSerializer):
     program_name = serializers.CharField(
         source='student.program.name', read_only=True
     )
-    semester_name = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    semester_name = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
     academic_year = serializers.CharField(
         source='semester.academic_year.name', read_only=True
     )
@@ -465,9 +548,17 @@ class ReportCardListSerializer(serializers.ModelSerializer):
             'credits_earned', 'rank', 'is_published', 'published_at',
             'generated_by', 'generated_by_name', 'generated_at'
         ]
+        select_related = (
+            'student__user', 'student__program', 'semester__academic_year',
+            'generated_by'
+        )
+        property_fields = {
+            'student.user.get_full_name': FULL_NAME_COLUMNS,
+            'generated_by.get_full_name': FULL_NAME_COLUMNS,
+        }
 
 
-class ReportCardDetailSerializer(serializers.ModelSerializer):
+class ReportCardDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Detail serializer for ReportCard with all fields and computed properties."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -484,89 +575,109 @@ class ReportCardDetailSerializer(serializers.ModelSerializer):
     program_code = serializers.CharField(
         source='student.program.code', read_only=True
     )
-    student_level = serializers.CharField(
-        source='student.current_level.get_name_display', read_only=True
-    )
-    semester_name = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    student_level = ChoiceDisplayField(LEVEL_LABELS, source='student.current_level.name')
+    semester_name = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
     academic_year = serializers.CharField(
         source='semester.academic_year.name', read_only=True
     )
     generated_by_name = serializers.CharField(
         source='generated_by.get_full_name', read_only=True
     )
-    course_grades_count = serializers.SerializerMethodField()
     courses = serializers.SerializerMethodField()
     rank = serializers.SerializerMethodField()
     
     class Meta:
         model = ReportCard
-        fields = '__all__'
+        fields = [
+            'id', 'student_name', 'student_matricule', 'student_email',
+            'student_program', 'program_code', 'student_level', 'semester_name',
+            'academic_year', 'generated_by_name', 'course_grades_count',
+            'courses', 'rank', 'gpa', 'total_credits', 'credits_earned',
+            'remarks', 'is_published', 'published_at', 'generated_at', 'student',
+            'semester', 'generated_by'
+        ]
+        select_related = (
+            'student__user', 'student__program', 'student__current_level',
+            'semester__academic_year', 'generated_by'
+        )
     
-    def get_course_grades_count(self, obj):
-        return CourseGrade.objects.filter(
-            student=obj.student,
-            semester=obj.semester
-        ).count()
+    def _course_grades(self, obj):
+        if not hasattr(obj, '_course_grades'):
+            obj._course_grades = list(CourseGrade.objects.filter(
+                student=obj.student,
+                semester=obj.semester
+            ).select_related('course'))
+        return obj._course_grades
 
     def get_rank(self, obj):
         if obj.rank:
             return obj.rank
         
-        # Calculate dynamic global rank if not stored
-        all_cards = ReportCard.objects.filter(
-            semester=obj.semester,
-            student__program=obj.student.program
-        ).order_by('-gpa')
-        
-        rank = 1
-        for card in all_cards:
-            if card.id == obj.id:
-                return rank
-            rank += 1
-        return rank
+        # Calculate dynamic global rank if not stored:
+        # cards ranked ahead (higher GPA, ties broken by id) + 1
+        if not hasattr(obj, '_dynamic_rank'):
+            obj._dynamic_rank = ReportCard.objects.filter(
+                Q(gpa__gt=obj.gpa) | Q(gpa=obj.gpa, id__lt=obj.id),
+                semester_id=obj.semester_id,
+                student__program_id=obj.student.program_id
+            ).count() + 1
+        return obj._dynamic_rank
 
     def get_courses(self, obj):
-        course_grades = CourseGrade.objects.filter(
+        # A published report card serves the payload stored on publication
+        if obj.is_published and obj.courses_payload is not None:
+            return obj.courses_payload
+        return self._build_courses(obj)
+
+    @classmethod
+    def render_courses_payload(cls, report_card):
+        """Course details of report_card, as stored in courses_payload."""
+        # Stored as rendered (decimals become floats) so both paths match
+        return json.loads(json.dumps(cls()._build_courses(report_card), cls=JSONEncoder))
+
+    def _build_courses(self, obj):
+        course_grades = self._course_grades(obj)
+        if not course_grades:
+            return []
+
+        # Individual exams details for every course, fetched once
+        exams_by_course = defaultdict(list)
+        for g in Grade.objects.filter(
             student=obj.student,
-            semester=obj.semester
-        ).select_related('course')
-        
-        result = []
-        for cg in course_grades:
-            # Get individual exams details
-            exams = Grade.objects.filter(
-                student=obj.student,
-                exam__course=cg.course,
-                exam__semester=obj.semester
-            ).select_related('exam')
-            
-            exam_details = [{
-                'name': g.exam.get_exam_type_display(),
+            exam__semester=obj.semester
+        ).select_related('exam').only(
+            'score', 'exam__course', 'exam__exam_type', 'exam__max_score', 'exam__weight'
+        ):
+            exams_by_course[g.exam.course_id].append({
+                'name': EXAM_TYPE_LABELS.get(g.exam.exam_type, g.exam.exam_type),
                 'score': g.score,
                 'max_score': g.exam.max_score,
                 'weight': g.exam.weight
-            } for g in exams]
+            })
 
-            # Calculate class stats for this course
-            all_grades = CourseGrade.objects.filter(
-                course=cg.course,
-                semester=obj.semester
-            ).values_list('final_score', flat=True)
-            
-            all_scores = [float(s) for s in all_grades]
-            avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-            max_score = max(all_scores) if all_scores else 0
-            min_score = min(all_scores) if all_scores else 0
-            
-            # Calculate rank in course
-            sorted_scores = sorted(all_scores, reverse=True)
-            try:
-                rank = sorted_scores.index(float(cg.final_score)) + 1
-            except ValueError:
-                rank = '-'
+        # Class stats and rank for all courses in one grouped query:
+        # rank = number of students with a strictly better score + 1
+        better_than_student = reduce(or_, [
+            Q(course_id=cg.course_id, final_score__gt=cg.final_score)
+            for cg in course_grades
+        ])
+        stats_by_course = {
+            row['course']: row
+            for row in CourseGrade.objects.filter(
+                semester=obj.semester,
+                course_id__in=[cg.course_id for cg in course_grades]
+            ).values('course').annotate(
+                avg_score=Avg('final_score'),
+                max_score=Max('final_score'),
+                min_score=Min('final_score'),
+                total_students=Count('id'),
+                better_count=Count('id', filter=better_than_student)
+            ).order_by()
+        }
 
+        result = []
+        for cg in course_grades:
+            stats = stats_by_course[cg.course_id]
             result.append({
                 'course_name': cg.course.name,
                 'course_code': cg.course.code,
@@ -574,48 +685,54 @@ class ReportCardDetailSerializer(serializers.ModelSerializer):
                 'coefficient': cg.course.coefficient,
                 'final_score': cg.final_score,
                 'grade_letter': cg.grade_letter,
-                'evaluations': exam_details,
-                'class_avg': round(avg_score, 2),
-                'class_max': max_score,
-                'class_min': min_score,
-                'rank': rank,
-                'total_students': len(all_scores)
+                'evaluations': exams_by_course[cg.course_id],
+                'class_avg': round(float(stats['avg_score']), 2),
+                'class_max': float(stats['max_score']),
+                'class_min': float(stats['min_score']),
+                'rank': stats['better_count'] + 1,
+                'total_students': stats['total_students']
             })
-            
+
         return result
 
 
 # Backward compatibility serializers
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Default serializer for Course (backward compatibility)."""
     program_name = serializers.CharField(source='program.name', read_only=True)
-    course_type_display = serializers.CharField(
-        source='get_course_type_display', read_only=True
-    )
+    course_type_display = ChoiceDisplayField(COURSE_TYPE_LABELS, source='course_type')
     total_hours = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Course
-        fields = '__all__'
+        fields = [
+            'id', 'program_name', 'course_type_display', 'total_hours', 'name',
+            'code', 'course_type', 'credits', 'hours_lecture', 'hours_practical',
+            'hours_tutorial', 'description', 'semester_type', 'coefficient',
+            'is_active', 'created_at', 'updated_at', 'program', 'level',
+            'prerequisites'
+        ]
 
 
-class ExamSerializer(serializers.ModelSerializer):
+class ExamSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Default serializer for Exam (backward compatibility)."""
     course_name = serializers.CharField(source='course.name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
-    exam_type_display = serializers.CharField(
-        source='get_exam_type_display', read_only=True
-    )
+    exam_type_display = ChoiceDisplayField(EXAM_TYPE_LABELS, source='exam_type')
     classroom_name = serializers.CharField(
         source='classroom.name', read_only=True
     )
 
     class Meta:
         model = Exam
-        fields = '__all__'
+        fields = [
+            'id', 'course_name', 'course_code', 'exam_type_display',
+            'classroom_name', 'exam_type', 'date', 'start_time', 'end_time',
+            'max_score', 'weight', 'created_at', 'course', 'semester', 'classroom'
+        ]
 
 
-class GradeSerializer(serializers.ModelSerializer):
+class GradeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Default serializer for Grade (backward compatibility)."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -630,10 +747,14 @@ class GradeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Grade
-        fields = '__all__'
+        fields = [
+            'id', 'student_name', 'student_matricule', 'exam_name', 'percentage',
+            'score', 'remarks', 'is_absent', 'graded_at', 'updated_at', 'student',
+            'exam', 'graded_by'
+        ]
 
 
-class CourseGradeSerializer(serializers.ModelSerializer):
+class CourseGradeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Default serializer for CourseGrade (backward compatibility)."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
@@ -643,18 +764,25 @@ class CourseGradeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CourseGrade
-        fields = '__all__'
+        fields = [
+            'id', 'student_name', 'course_name', 'course_code', 'final_score',
+            'grade_letter', 'course_credits', 'is_validated', 'validated_at',
+            'created_at', 'updated_at', 'student', 'course', 'semester',
+            'validated_by'
+        ]
 
 
-class ReportCardSerializer(serializers.ModelSerializer):
+class ReportCardSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Default serializer for ReportCard (backward compatibility)."""
     student_name = serializers.CharField(
         source='student.user.get_full_name', read_only=True
     )
-    semester_display = serializers.CharField(
-        source='semester.get_semester_type_display', read_only=True
-    )
+    semester_display = ChoiceDisplayField(SEMESTER_TYPE_LABELS, source='semester.semester_type')
 
     class Meta:
         model = ReportCard
-        fields = '__all__'
+        fields = [
+            'id', 'student_name', 'semester_display', 'gpa', 'total_credits',
+            'credits_earned', 'rank', 'remarks', 'is_published', 'published_at',
+            'generated_at', 'student', 'semester', 'generated_by'
+        ]
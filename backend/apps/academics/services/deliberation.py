@@ -1,66 +1,135 @@
-from decimal import Decimal
+from functools import lru_cache
 from django.db import transaction
 from django.db.models import Sum, F, Avg
 from apps.students.models import Student, StudentPromotion, Enrollment
-from apps.academics.models import CourseGrade, ReportCard
+from apps.academics.models import (
+    CourseGrade, ReportCard, RECALCULATION_BATCH_SIZE, ZERO, gpa_aggregates
+)
 from apps.university.models import AcademicYear, Level
 
+
+@lru_cache(maxsize=1)
+def levels_by_order():
+    """
+    Niveaux indexés par ordre, chargés une seule fois par processus.
+    Le cache est vidé par les signaux post_save/post_delete de Level.
+    """
+    return {level.order: level for level in Level.objects.all()}
+
+
 class DeliberationService:
     @staticmethod
     def calculate_gpa(student, semester):
         """Calcule et met à jour le bulletin (ReportCard) d'un semestre."""
-        # Get/Create ReportCard
-        report_card, _ = ReportCard.objects.get_or_create(
-            student=student,
-            semester=semester,
-            defaults={
-                'generated_by': None # System/Auto
-            }
-        )
-        report_card.calculate_gpa()
-        return report_card
+        # One aggregate, one read of the card, then its INSERT or UPDATE
+        return DeliberationService.calculate_gpas(student, [semester])[semester.pk]
 
     @staticmethod
-    def deliberate_student(student, academic_year):
+    def _refresh_report_cards(student_ids, semester_ids):
         """
-        Effectue la délibération annuelle pour un étudiant.
-        Retourne l'objet StudentPromotion créé.
+        Calcule et met à jour les bulletins des étudiants et semestres donnés.
+        Une seule requête groupée par (étudiant, semestre) pour les moyennes, puis
+        un bulk_create des bulletins manquants et un bulk_update des existants.
+        Retourne un dict {(student_id, semester_id): ReportCard}.
         """
-        # 1. Ensure both semester GPAs are calculated
-        semesters = academic_year.semesters.all().order_by('semester_type')
-        if not semesters.exists():
-            raise ValueError("Aucun semestre défini pour cette année académique.")
+        totals_by_pair = {
+            (row['student'], row['semester']): row
+            for row in CourseGrade.objects.filter(
+                student_id__in=student_ids,
+                semester_id__in=semester_ids
+            ).values('student', 'semester').annotate(**gpa_aggregates()).order_by()
+        }
+        report_cards = {
+            (report_card.student_id, report_card.semester_id): report_card
+            for report_card in ReportCard.objects.filter(
+                student_id__in=student_ids,
+                semester_id__in=semester_ids
+            ).only(
+                'id', 'student', 'semester', 'gpa', 'total_credits',
+                'credits_earned', 'course_grades_count'
+            )
+        }
 
-        s1 = semesters.filter(semester_type='S1').first()
-        s2 = semesters.filter(semester_type='S2').first()
+        to_create = []
+        to_update = []
+        for student_id in student_ids:
+            for semester_id in semester_ids:
+                key = (student_id, semester_id)
+                totals = totals_by_pair.get(key)
+                report_card = report_cards.get(key)
+                if report_card is None:
+                    report_card = ReportCard(
+                        student_id=student_id,
+                        semester_id=semester_id,
+                        generated_by=None # System/Auto
+                    )
+                    report_cards[key] = report_card
+                    report_card._apply_totals(totals)
+                    to_create.append(report_card)
+                elif report_card._apply_totals(totals):
+                    to_update.append(report_card)
 
-        report_s1 = DeliberationService.calculate_gpa(student, s1) if s1 else None
-        report_s2 = DeliberationService.calculate_gpa(student, s2) if s2 else None
+        with transaction.atomic():
+            if to_create:
+                ReportCard.objects.bulk_create(to_create, batch_size=RECALCULATION_BATCH_SIZE)
+            if to_update:
+                ReportCard.objects.bulk_update(
+                    to_update,
+                    ['gpa', 'total_credits', 'credits_earned', 'course_grades_count'],
+                    batch_size=RECALCULATION_BATCH_SIZE
+                )
+        return report_cards
 
-        # 2. Calculate Annual GPA
-        total_points = Decimal('0.00')
-        total_credits = 0
+    @staticmethod
+    def calculate_gpas(student, semesters):
+        """
+        Calcule et met à jour les bulletins de plusieurs semestres d'un étudiant.
+        Retourne un dict {semester_id: ReportCard}.
+        """
+        report_cards = DeliberationService._refresh_report_cards(
+            [student.pk], [semester.pk for semester in semesters]
+        )
+        return {
+            semester_id: report_card
+            for (_, semester_id), report_card in report_cards.items()
+        }
 
-        if report_s1:
-            total_points += report_s1.gpa * report_s1.total_credits
-            total_credits += report_s1.total_credits
-        
-        if report_s2:
-            total_points += report_s2.gpa * report_s2.total_credits
-            total_credits += report_s2.total_credits
+    @staticmethod
+    def _deliberation_semesters(academic_year):
+        """Retourne les semestres (S1, S2) de l'année ; l'un ou l'autre peut être None."""
+        semesters = list(academic_year.semesters.all().order_by('semester_type'))
+        if not semesters:
+            raise ValueError("Aucun semestre défini pour cette année académique.")
 
-        annual_gpa = (total_points / total_credits) if total_credits > 0 else Decimal('0.00')
+        s1 = next((s for s in semesters if s.semester_type == 'S1'), None)
+        s2 = next((s for s in semesters if s.semester_type == 'S2'), None)
+        return s1, s2
 
-        # 3. Determine Decision
+    @staticmethod
+    def _annual_gpa(report_cards):
+        """Moyenne annuelle pondérée par les crédits des bulletins semestriels."""
+        report_cards = [report_card for report_card in report_cards if report_card.total_credits]
+        total_credits = sum(report_card.total_credits for report_card in report_cards)
+        if not total_credits:
+            return ZERO
+
+        total_points = sum(
+            (report_card.gpa * report_card.total_credits for report_card in report_cards),
+            ZERO
+        )
+        return total_points / total_credits
+
+    @staticmethod
+    def _decision(student, annual_gpa, next_level):
+        """
+        Décision de fin d'année : (décision, niveau suivant, remarques).
+        `next_level` n'est utilisé que si l'étudiant est admis.
+        """
         # Rule: GPA >= 10 => PROMOTED, else REPEATED
         if annual_gpa >= 10:
             decision = StudentPromotion.PromotionDecision.PROMOTED
-            
-            # Determine next level
-            current_level_order = student.current_level.order
-            next_level = Level.objects.filter(order=current_level_order + 1).first()
-            level_to = next_level if next_level else student.current_level 
-            
+            level_to = next_level if next_level else student.current_level
+
             if not next_level:
                 remarks = "Fin de cycle - Diplômable"
             else:
@@ -71,6 +140,29 @@ class DeliberationService:
             level_to = student.current_level
             remarks = "Redoublement"
 
+        return decision, level_to, remarks
+
+    @staticmethod
+    def deliberate_student(student, academic_year):
+        """
+        Effectue la délibération annuelle pour un étudiant.
+        Retourne l'objet StudentPromotion créé.
+        """
+        # 1. Ensure both semester GPAs are calculated
+        s1, s2 = DeliberationService._deliberation_semesters(academic_year)
+        report_cards = DeliberationService.calculate_gpas(
+            student, [s for s in (s1, s2) if s]
+        )
+
+        # 2. Calculate Annual GPA
+        annual_gpa = DeliberationService._annual_gpa(report_cards.values())
+
+        # 3. Determine Decision
+        current_level_order = student.current_level.order
+        decision, level_to, remarks = DeliberationService._decision(
+            student, annual_gpa, levels_by_order().get(current_level_order + 1)
+        )
+
         # 4. Save Promotion Record
         with transaction.atomic():
             promotion, created = StudentPromotion.objects.update_or_create(
@@ -87,3 +179,68 @@ class DeliberationService:
             )
             
         return promotion
+
+    @staticmethod
+    def deliberate_cohort(academic_year, program=None):
+        """
+        Effectue la délibération annuelle de tous les étudiants actifs
+        (éventuellement d'un seul programme) en un nombre constant de requêtes :
+        une agrégation groupée pour tous les bulletins, puis un bulk_create
+        (upsert) des délibérations.
+        Un étudiant dont la délibération échoue (sans niveau, par exemple) est
+        écarté sans bloquer les autres.
+        Retourne (promotions, échecs) : la liste des StudentPromotion (sans pk,
+        upsert oblige) et les couples (étudiant, exception) des étudiants écartés.
+        """
+        s1, s2 = DeliberationService._deliberation_semesters(academic_year)
+        semester_ids = [s.pk for s in (s1, s2) if s]
+
+        students = Student.objects.filter(
+            status=Student.Status.ACTIVE
+        ).select_related('user', 'current_level', 'program')
+        if program is not None:
+            students = students.filter(program=program)
+        students = list(students)
+        if not students:
+            return [], []
+
+        with transaction.atomic():
+            report_cards = DeliberationService._refresh_report_cards(
+                [student.pk for student in students], semester_ids
+            )
+
+            promotions = []
+            failures = []
+            for student in students:
+                try:
+                    annual_gpa = DeliberationService._annual_gpa(
+                        report_cards[(student.pk, semester_id)]
+                        for semester_id in semester_ids
+                    )
+                    decision, level_to, remarks = DeliberationService._decision(
+                        student,
+                        annual_gpa,
+                        levels_by_order().get(student.current_level.order + 1)
+                    )
+                except Exception as e:
+                    failures.append((student, e))
+                    continue
+                promotions.append(StudentPromotion(
+                    student=student,
+                    academic_year=academic_year,
+                    program=student.program,
+                    level_from=student.current_level,
+                    level_to=level_to,
+                    annual_gpa=annual_gpa,
+                    decision=decision,
+                    remarks=remarks
+                ))
+
+            StudentPromotion.objects.bulk_create(
+                promotions,
+                batch_size=RECALCULATION_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['student', 'academic_year'],
+                update_fields=['program', 'level_from', 'level_to', 'annual_gpa', 'decision', 'remarks']
+            )
+        return promotions, failures
@@ -1,80 +1,262 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum, F
-from decimal import Decimal
-from .models import Grade, Exam, CourseGrade
-from apps.students.models import Student
+from django.db.models import DecimalField, F, Sum
+from django.db.models.functions import Now
+from .models import (
+    Course, Grade, Exam, CourseGrade, ReportCard, grade_letter_for,
+    GPA_QUANTUM, RECALCULATION_BATCH_SIZE, ZERO,
+)
+from apps.university.models import Level
+from .services.deliberation import levels_by_order
+
+def _course_average_aggregates():
+    """
+    Weighted sum of the normalized scores and total weight of a set of grades.
+    """
+    # Grade.normalized_score is already out of 20 (0 when absent). Exams
+    # without weight add nothing to either sum.
+    return {
+        'weighted': Sum(F('normalized_score') * F('exam__weight'), output_field=DecimalField()),
+        'weight': Sum('exam__weight'),
+    }
+
+
+def _course_average(weighted, weight):
+    # Calculate final average, rounded to 2 decimal places
+    if weight:
+        final_average = weighted / weight
+    else:
+        final_average = ZERO
+    return final_average.quantize(GPA_QUANTUM)
+
+
+def _queue_on_commit(pending, callback, items):
+    """
+    Add items to the thread-local set pending.items, handled by callback
+    once when the transaction commits.
+    """
+    # A rolled back transaction drops its on_commit callbacks: check the
+    # connection rather than trusting the thread-local set alone.
+    queued = any(
+        entry[1] is callback
+        for entry in transaction.get_connection().run_on_commit
+    )
+    if getattr(pending, 'items', None) is None or not queued:
+        pending.items = set(items)
+        # Outside a transaction, on_commit runs the callback right away:
+        # the items must be in place before it is registered
+        transaction.on_commit(callback)
+    else:
+        pending.items.update(items)
+
+
+def _take_pending(pending):
+    items = getattr(pending, 'items', None) or set()
+    pending.items = None
+    return items
 
-def calculate_student_course_grade(student, course, semester):
+
+def calculate_student_course_grade(student_id, course_id, semester_id):
     """
     Calculate the weighted average for a student in a specific course and semester.
     Updates or creates the CourseGrade record.
     """
-    # Get all grades for this student in this course/semester
-    grades = Grade.objects.filter(
-        student=student,
+    totals = Grade.objects.filter(
+        student_id=student_id,
+        exam__course_id=course_id,
+        exam__semester_id=semester_id
+    ).aggregate(**_course_average_aggregates())
+
+    credits = Course.objects.values_list('credits', flat=True).get(pk=course_id)
+    _save_course_grades(
+        [((student_id, course_id, semester_id), _course_average(totals['weighted'], totals['weight']))],
+        {course_id: credits}
+    )
+
+
+def _save_course_grades(final_scores, credits_by_course):
+    """
+    Write ((student_id, course_id, semester_id), final_score) pairs with one
+    INSERT ... ON CONFLICT DO UPDATE per batch, consuming the pairs as they
+    come: at most one batch of CourseGrades is held in memory.
+
+    A None score marks a bucket left without grades: its CourseGrade, if
+    any, is set to 0 and none is created. Bulk writes skip CourseGrade.save()
+    and its signals: the derived fields are set here and the report card
+    refresh is queued explicitly.
+    """
+    def upsert(course_grades):
+        CourseGrade.objects.bulk_create(
+            course_grades,
+            update_conflicts=True,
+            unique_fields=['student', 'course', 'semester'],
+            update_fields=['final_score', 'grade_letter', 'course_credits', 'updated_at']
+        )
+
+    report_cards = set()
+    emptied = defaultdict(list)
+    course_grades = []
+    with transaction.atomic():
+        for (student_id, course_id, semester_id), final_score in final_scores:
+            report_cards.add((student_id, semester_id))
+            if final_score is None:
+                emptied[(course_id, semester_id)].append(student_id)
+                continue
+            course_grades.append(CourseGrade(
+                student_id=student_id,
+                course_id=course_id,
+                semester_id=semester_id,
+                final_score=final_score,
+                grade_letter=grade_letter_for(final_score),
+                course_credits=credits_by_course[course_id],
+            ))
+            if len(course_grades) == RECALCULATION_BATCH_SIZE:
+                upsert(course_grades)
+                course_grades = []
+        upsert(course_grades)
+
+        for (course_id, semester_id), student_ids in emptied.items():
+            # update() bypasses auto_now: let the database stamp updated_at
+            CourseGrade.objects.filter(
+                student_id__in=student_ids,
+                course_id=course_id,
+                semester_id=semester_id
+            ).update(final_score=ZERO, grade_letter=grade_letter_for(ZERO), updated_at=Now())
+        _queue_report_card_refresh(report_cards)
+
+
+def calculate_course_grades(course, semester, student_ids):
+    """
+    Calculate the CourseGrades of several students in a course and semester,
+    with one grouped aggregate for all students.
+    """
+    # Plain (student_id, weighted, weight) tuples, streamed into the upsert
+    rows = Grade.objects.filter(
+        student_id__in=student_ids,
         exam__course=course,
         exam__semester=semester
-    ).select_related('exam')
-
-    total_weighted_score = Decimal('0.00')
-    total_weight = Decimal('0.00')
-
-    for grade in grades:
-        exam = grade.exam
-        weight = exam.weight
-        
-        # If exam has no weight or max_score is 0, skip contribution to average but careful
-        if weight == 0:
-            continue
-            
-        # Determine score
-        if grade.is_absent:
-            score = Decimal('0.00')
-        else:
-            score = grade.score
-            
-        # Normalize score to 20 if max_score is not 20
-        # Formula: (score / max_score) * 20
-        # If max_score is 0, avoid division by zero (should strictly be validated elsewhere)
-        if exam.max_score and exam.max_score > 0:
-            normalized_score = (score / exam.max_score) * Decimal('20.00')
-        else:
-            normalized_score = score # Fallback, assume out of 20
-            
-        total_weighted_score += normalized_score * weight
-        total_weight += weight
-
-    # Calculate final average
-    if total_weight > 0:
-        final_average = total_weighted_score / total_weight
-    else:
-        final_average = Decimal('0.00')
-        
-    # Round to 2 decimal places
-    final_average = final_average.quantize(Decimal('0.01'))
-
-    # Update or Create CourseGrade
-    CourseGrade.objects.update_or_create(
-        student=student,
-        course=course,
-        semester=semester,
-        defaults={
-            'final_score': final_average
-        }
+    ).values('student').annotate(
+        **_course_average_aggregates()
+    ).values_list('student', 'weighted', 'weight').order_by()
+    _save_course_grades(
+        (
+            ((student_id, course.pk, semester.pk), _course_average(weighted, weight))
+            for student_id, weighted, weight in rows.iterator(chunk_size=RECALCULATION_BATCH_SIZE)
+        ),
+        {course.pk: course.credits}
     )
 
+
+def recalculate_course_grades(keys):
+    """
+    Recalculate the CourseGrades of (student_id, course_id, semester_id)
+    buckets with one grouped aggregate and one upsert, however many buckets.
+
+    For writes that skip the Grade signals (bulk_create, bulk_record).
+    """
+    keys = set(keys)
+    if not keys:
+        return
+
+    # A bucket left without grades keeps its CourseGrade, at 0 as before,
+    # but doesn't get one created
+    final_scores = dict.fromkeys(keys)
+    buckets = ('student', 'exam__course', 'exam__semester')
+    for student_id, course_id, semester_id, weighted, weight in Grade.objects.filter(
+        student_id__in={student_id for student_id, _, _ in keys},
+        exam__course_id__in={course_id for _, course_id, _ in keys},
+        exam__semester_id__in={semester_id for _, _, semester_id in keys}
+    ).values(*buckets).annotate(
+        **_course_average_aggregates()
+    ).values_list(*buckets, 'weighted', 'weight').order_by().iterator(
+        chunk_size=RECALCULATION_BATCH_SIZE
+    ):
+        key = (student_id, course_id, semester_id)
+        if key in final_scores:
+            final_scores[key] = _course_average(weighted, weight)
+
+    credits_by_course = dict(
+        Course.objects.filter(
+            pk__in={course_id for _, course_id, _ in keys}
+        ).values_list('id', 'credits')
+    )
+    _save_course_grades(final_scores.items(), credits_by_course)
+
+
+# (student_id, course_id, semester_id) buckets whose course grades need a
+# recalculation at commit
+_pending_course_grades = threading.local()
+
+
+def _recalculate_pending_course_grades():
+    recalculate_course_grades(_take_pending(_pending_course_grades))
+
+
+# Buckets collected by defer_course_grade_recalculation() on this thread
+_deferred_course_grades = threading.local()
+
+
+@contextmanager
+def defer_course_grade_recalculation():
+    """
+    Recalculate the course grades touched by Grade saves and deletes in the
+    block once, on exit, instead of after each write.
+
+    Yields the set of (student_id, course_id, semester_id) buckets: writes
+    that skip the Grade signals (bulk_create, bulk_record) add theirs to it.
+    Thread-local, unlike disconnecting the receiver, which would also drop
+    the recalculations of other threads. Nested blocks join the outer one.
+
+    The recalculation on exit is synchronous, even inside a transaction: the
+    way for code that writes grades in a transaction to read the updated
+    CourseGrades back before it commits.
+    """
+    outer = getattr(_deferred_course_grades, 'keys', None)
+    keys = set() if outer is None else outer
+    _deferred_course_grades.keys = keys
+    try:
+        yield keys
+    finally:
+        _deferred_course_grades.keys = outer
+    if outer is None:
+        recalculate_course_grades(keys)
+
+
 @receiver(post_save, sender=Grade)
 @receiver(post_delete, sender=Grade)
 def update_course_grade_on_grade_change(sender, instance, **kwargs):
     """
-    When a grade is added, modified, or deleted, recalculate the CourseGrade.
+    When a grade is added, modified, or deleted, recalculate the CourseGrade
+    once per transaction, however many grades of the same student, course
+    and semester were saved or deleted.
+
+    Unlike the original per-save recalculation, the CourseGrade is only up
+    to date once the transaction commits; in autocommit mode, as in the
+    shell or a management command, it is recalculated during the save.
+    Within a transaction, wrap the writes in
+    defer_course_grade_recalculation() to read it back before the commit.
     """
-    exam = instance.exam
-    calculate_student_course_grade(instance.student, exam.course, exam.semester)
+    if Grade.exam.is_cached(instance):
+        course_id, semester_id = instance.exam.course_id, instance.exam.semester_id
+    else:
+        # Only the two foreign keys, not the whole Exam row
+        course_id, semester_id = Exam.objects.filter(
+            pk=instance.exam_id
+        ).values_list('course_id', 'semester_id').get()
+    key = (instance.student_id, course_id, semester_id)
+    deferred = getattr(_deferred_course_grades, 'keys', None)
+    if deferred is not None:
+        deferred.add(key)
+    else:
+        _queue_on_commit(_pending_course_grades, _recalculate_pending_course_grades, [key])
 
 @receiver(post_save, sender=Exam)
-def update_course_grades_on_exam_change(sender, instance, created, **kwargs):
+def update_course_grades_on_exam_change(sender, instance, created, update_fields, **kwargs):
     """
     When an exam is modified (e.g. weight change), recalculate CourseGrade for ALL students
     who have a grade for this exam.
@@ -82,17 +264,76 @@ def update_course_grades_on_exam_change(sender, instance, created, **kwargs):
     if created:
         return # New exam has no grades yet
 
-    # Find all students who have a grade for this exam
-    # We can query Grade model
-    student_ids = Grade.objects.filter(exam=instance).values_list('student', flat=True).distinct()
-    
-    for student_id in student_ids:
-        # We need the student object, or just pass ID? helper expects object but can just get it?
-        # Optimization: calculate_student_course_grade takes student object.
-        # We can fetch students or modify helper to take ID.
-        # Let's fetch student to be safe with helper signature
-        try:
-            student = Student.objects.get(id=student_id)
-            calculate_student_course_grade(student, instance.course, instance.semester)
-        except Student.DoesNotExist:
-            continue
+    # Only the weight, max score, course and semester move the averages
+    changed = instance.changed_grading_fields(update_fields)
+    if not changed:
+        return
+    if 'max_score' in changed:
+        grades = list(Grade.objects.filter(exam=instance).only('id', 'score', 'is_absent'))
+        for grade in grades:
+            grade.exam = instance
+            grade.set_normalized_score()
+        Grade.objects.bulk_update(grades, ['normalized_score'], batch_size=RECALCULATION_BATCH_SIZE)
+
+    # All students who have a grade for this exam
+    calculate_course_grades(
+        instance.course,
+        instance.semester,
+        Grade.objects.filter(exam=instance).values('student')
+    )
+
+
+@receiver(post_save, sender=Course)
+def sync_course_credits_on_course_change(sender, instance, created, **kwargs):
+    """
+    Keep CourseGrade.course_credits in step with the course's credits and
+    drop the cached report card details that show the course.
+    """
+    if created:
+        return # New course has no course grades yet
+
+    # update() bypasses auto_now: let the database stamp updated_at
+    CourseGrade.objects.filter(course=instance).exclude(
+        course_credits=instance.credits
+    ).update(course_credits=instance.credits, updated_at=Now())
+
+    # Course name, code, credits and coefficient appear in report card details
+    ReportCard.invalidate_courses_payload(
+        CourseGrade.objects.filter(course=instance).values('semester')
+    )
+
+
+@receiver(post_save, sender=Level)
+@receiver(post_delete, sender=Level)
+def clear_levels_cache_on_level_change(sender, instance, **kwargs):
+    """
+    Drop the cached {order: Level} map used by deliberations.
+    """
+    levels_by_order.cache_clear()
+
+
+# (student_id, semester_id) pairs whose report cards need a refresh at commit
+_pending_report_cards = threading.local()
+
+
+def _refresh_pending_report_cards():
+    pairs = _take_pending(_pending_report_cards)
+    ReportCard.recalculate_for_students(pairs)
+    # Class averages and ranks move for every report card of the semester
+    ReportCard.invalidate_courses_payload({semester_id for _, semester_id in pairs})
+
+
+def _queue_report_card_refresh(pairs):
+    _queue_on_commit(_pending_report_cards, _refresh_pending_report_cards, pairs)
+
+
+@receiver(post_save, sender=CourseGrade)
+@receiver(post_delete, sender=CourseGrade)
+def queue_report_card_refresh_on_course_grade_change(sender, instance, **kwargs):
+    """
+    Refresh the enclosing ReportCard (averages and course grade count) once
+    per transaction, however many CourseGrades of the same student and
+    semester were saved or deleted, and drop the cached course details of
+    the semester's report cards.
+    """
+    _queue_report_card_refresh([(instance.student_id, instance.semester_id)])
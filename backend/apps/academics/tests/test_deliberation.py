@@ -0,0 +1,63 @@
+"""
+Tests for the deliberation endpoint.
+"""
+
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.academics.models import CourseGrade
+from apps.academics.services.deliberation import DeliberationService
+from apps.academics.tests.test_grade_writes import _GradeWriteFixture
+from apps.academics.views import DeliberationViewSet
+from apps.students.models import StudentPromotion
+
+
+class DeliberationProcessTests(_GradeWriteFixture, TestCase):
+    """Tests for DeliberationViewSet.process."""
+
+    factory = APIRequestFactory()
+    process = staticmethod(DeliberationViewSet.as_view({'post': 'process'}))
+
+    def _post(self, data):
+        request = self.factory.post('/', data, format='json')
+        force_authenticate(request, user=self.admin_user)
+        return self.process(request)
+
+    def test_program_reports_failing_students_one_by_one(self):
+        """Test that a failing student doesn't stop the rest of the cohort."""
+        CourseGrade.objects.bulk_create([
+            CourseGrade(student=student, course=self.course, semester=self.semester,
+                        final_score=Decimal('12.00'), course_credits=3)
+            for student in (self.student, self.other_student)
+        ])
+        decision = DeliberationService._decision
+
+        def fail_for_other_student(student, annual_gpa, next_level):
+            if student == self.other_student:
+                raise AttributeError("'NoneType' object has no attribute 'order'")
+            return decision(student, annual_gpa, next_level)
+
+        with mock.patch.object(
+            DeliberationService, '_decision', side_effect=fail_for_other_student
+        ):
+            response = self._post({
+                'academic_year_id': self.academic_year.id,
+                'program_id': self.program.id,
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['processed_count'], 2)
+        deliberated, failed = response.data['results']
+        self.assertEqual(
+            (deliberated['matricule'], deliberated['annual_gpa']),
+            (self.student.student_id, Decimal('12.00'))
+        )
+        self.assertIn('error', failed)
+        self.assertEqual(
+            list(StudentPromotion.objects.values_list('student', flat=True)),
+            [self.student.id]
+        )
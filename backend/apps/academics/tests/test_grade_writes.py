@@ -0,0 +1,528 @@
+"""
+Regression tests for the grade write paths.
+
+Stored course grades and report cards are checked against the formulas of
+the original per-row implementation: the exam weighted average of the
+scores out of 20, rounded to 2 places, and the credit weighted average of
+the course grades.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+import openpyxl
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers, status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.academics import signals
+from apps.academics.models import Course, CourseGrade, Exam, Grade, ReportCard
+from apps.academics.serializers import GradeCreateSerializer
+from apps.academics.tests.helpers import build_grade
+from apps.academics.views import GradeViewSet
+from apps.students.models import Student
+from apps.university.models import (
+    AcademicYear, Department, Faculty, Level, Program, Semester
+)
+
+
+def baseline_final_score(grades):
+    """Course average of (score, is_absent, max_score, weight) tuples."""
+    weighted = Decimal('0.00')
+    total_weight = Decimal('0.00')
+    for score, is_absent, max_score, weight in grades:
+        if weight == 0:
+            continue
+        score = Decimal('0.00') if is_absent else score
+        weighted += (score / max_score) * Decimal('20.00') * weight
+        total_weight += weight
+    if total_weight > 0:
+        return (weighted / total_weight).quantize(Decimal('0.01'))
+    return Decimal('0.00')
+
+
+def baseline_gpa(course_grades):
+    """
+    Report card (gpa, total_credits, credits_earned) of (final_score,
+    credits) pairs. The average is rounded as the 2 place DecimalField
+    stored it: half to even.
+    """
+    total_credits = sum(credits for _, credits in course_grades)
+    weighted = sum(final_score * credits for final_score, credits in course_grades)
+    return (
+        (weighted / total_credits).quantize(Decimal('0.01')),
+        total_credits,
+        sum(credits for final_score, credits in course_grades if final_score >= 10),
+    )
+
+
+class _GradeWriteFixture:
+    """
+    Program with two students, a 3 credit course graded by a midterm out of
+    20 and a final out of 40, and a 2 credit course with a single exam.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        super().setUpTestData()
+        cls.create_fixture()
+
+    @classmethod
+    def create_fixture(cls):
+        """Create the fixture objects as class attributes."""
+        password = make_password('testpass123')
+        cls.admin_user, student_user, other_user = User.objects.bulk_create([
+            User(username='grades_admin', email='grades_admin@test.com',
+                 password=password, role='ADMIN'),
+            User(username='grades_student', email='grades_student@test.com',
+                 password=password, role='STUDENT'),
+            User(username='grades_other', email='grades_other@test.com',
+                 password=password, role='STUDENT'),
+        ])
+
+        cls.academic_year = AcademicYear.objects.create(
+            name='2023-2024',
+            start_date=date(2023, 9, 1),
+            end_date=date(2024, 6, 30),
+            is_current=True
+        )
+        cls.semester = Semester.objects.create(
+            academic_year=cls.academic_year,
+            semester_type='S1',
+            start_date=date(2023, 9, 1),
+            end_date=date(2024, 1, 31),
+            is_current=True
+        )
+        faculty = Faculty.objects.create(name='Faculty of Science', code='SCI')
+        department = Department.objects.create(
+            name='Computer Science', code='CS', faculty=faculty
+        )
+        cls.level = Level.objects.create(name='L1', order=1)
+        cls.program = Program.objects.create(
+            name='Computer Science L1', code='CS-L1', department=department
+        )
+        cls.program.levels.add(cls.level)
+
+        cls.student, cls.other_student = (
+            Student.objects.create(
+                user=user,
+                student_id=student_id,
+                program=cls.program,
+                current_level=cls.level,
+                enrollment_date=date(2023, 9, 1),
+                status='ACTIVE'
+            )
+            for user, student_id in ((student_user, 'STU001'), (other_user, 'STU002'))
+        )
+
+        cls.course, cls.other_course = Course.objects.bulk_create([
+            Course(name='Programming', code='CS101', program=cls.program,
+                   credits=3, level=cls.level),
+            Course(name='Algebra', code='MA101', program=cls.program,
+                   credits=2, level=cls.level),
+        ])
+        cls.midterm, cls.final, cls.other_exam = Exam.objects.bulk_create([
+            Exam(course=cls.course, exam_type='MIDTERM', semester=cls.semester,
+                 date=date(2023, 11, 15), start_time=time(9, 0), end_time=time(11, 0),
+                 max_score=Decimal('20.00'), weight=Decimal('0.40')),
+            Exam(course=cls.course, exam_type='FINAL', semester=cls.semester,
+                 date=date(2024, 1, 15), start_time=time(9, 0), end_time=time(12, 0),
+                 max_score=Decimal('40.00'), weight=Decimal('0.60')),
+            Exam(course=cls.other_course, exam_type='FINAL', semester=cls.semester,
+                 date=date(2024, 1, 20), start_time=time(14, 0), end_time=time(16, 0),
+                 max_score=Decimal('20.00'), weight=Decimal('1.00')),
+        ])
+
+
+class GradeBulkWriteTests(_GradeWriteFixture, TestCase):
+    """Tests for GradeViewSet.bulk_create and import_grades."""
+
+    factory = APIRequestFactory()
+    bulk_create = staticmethod(GradeViewSet.as_view({'post': 'bulk_create'}))
+    import_grades = staticmethod(GradeViewSet.as_view({'post': 'import_grades'}))
+
+    def _post(self, grades):
+        request = self.factory.post('/', {'grades': grades}, format='json')
+        force_authenticate(request, user=self.admin_user)
+        return self.bulk_create(request)
+
+    def _import(self, exam, rows):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['Matricule', 'Nom', 'Note', 'Absent', 'Remarques'])
+        for row in rows:
+            sheet.append(row)
+        buffer = BytesIO()
+        workbook.save(buffer)
+        request = self.factory.post('/', {
+            'exam_id': exam.id,
+            'file': SimpleUploadedFile('notes.xlsx', buffer.getvalue()),
+        }, format='multipart')
+        force_authenticate(request, user=self.admin_user)
+        return self.import_grades(request)
+
+    def test_creates_grades_and_course_grades(self):
+        """Test that the batch is stored and the course averages follow."""
+        response = self._post([
+            {'student': self.student.id, 'exam': self.midterm.id, 'score': '13.50'},
+            {'student': self.student.id, 'exam': self.final.id, 'score': '27.25'},
+            {'student': self.other_student.id, 'exam': self.final.id,
+             'score': '0', 'is_absent': True},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(Grade.objects.count(), 3)
+
+        course_grade = CourseGrade.objects.get(student=self.student, course=self.course)
+        self.assertEqual(course_grade.final_score, baseline_final_score([
+            (Decimal('13.50'), False, Decimal('20.00'), Decimal('0.40')),
+            (Decimal('27.25'), False, Decimal('40.00'), Decimal('0.60')),
+        ]))
+        self.assertEqual(course_grade.course_credits, 3)
+        self.assertEqual(
+            CourseGrade.objects.get(student=self.other_student, course=self.course).final_score,
+            Decimal('0.00')
+        )
+
+    def test_reports_existing_grades(self):
+        """Test that a grade already stored is reported, not overwritten."""
+        build_grade(student=self.student, exam=self.midterm, score=Decimal('8.00'))
+
+        response = self._post([
+            {'student': self.student.id, 'exam': self.midterm.id, 'score': '18.00'},
+            {'student': self.other_student.id, 'exam': self.midterm.id, 'score': '11.00'},
+        ])
+
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertIn('student', response.data['errors'][0]['errors'])
+        self.assertEqual(
+            Grade.objects.get(student=self.student, exam=self.midterm).score,
+            Decimal('8.00')
+        )
+
+    def test_reports_grades_inserted_concurrently(self):
+        """Test that a grade inserted after the duplicate check is reported."""
+        set_normalized_score = Grade.set_normalized_score
+
+        def insert_concurrently(grade):
+            set_normalized_score(grade)
+            if grade.student_id == self.other_student.id:
+                concurrent = Grade(
+                    student=self.other_student, exam=self.midterm, score=Decimal('9.00')
+                )
+                set_normalized_score(concurrent)
+                Grade.objects.bulk_create([concurrent])
+
+        with mock.patch.object(
+            Grade, 'set_normalized_score', autospec=True, side_effect=insert_concurrently
+        ):
+            response = self._post([
+                {'student': self.student.id, 'exam': self.midterm.id, 'score': '14.00'},
+                {'student': self.other_student.id, 'exam': self.midterm.id, 'score': '16.00'},
+            ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(
+            [record['student'] for record in response.data['records']], [self.student.id]
+        )
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertEqual(response.data['errors'][0]['data']['student'], self.other_student.id)
+        self.assertEqual(
+            Grade.objects.get(student=self.other_student, exam=self.midterm).score,
+            Decimal('9.00')
+        )
+        self.assertEqual(
+            CourseGrade.objects.get(student=self.student, course=self.course).final_score,
+            baseline_final_score([(Decimal('14.00'), False, Decimal('20.00'), Decimal('0.40'))])
+        )
+
+    def test_import_grades_upserts_and_recalculates(self):
+        """Test that an import updates, creates and recalculates in one pass."""
+        build_grade(student=self.student, exam=self.midterm, score=Decimal('8.00'))
+        build_grade(student=self.student, exam=self.final, score=Decimal('30.00'))
+        ReportCard.objects.create(student=self.student, semester=self.semester)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._import(self.midterm, [
+                ['STU001', 'Student', 15.5, 'N', 'Rattrapage'],
+                ['STU002', 'Other', None, 'OUI', ''],
+                ['STU999', 'Unknown', 12, 'N', ''],
+            ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(len(response.data['errors']), 1)
+
+        grade = Grade.objects.get(student=self.student, exam=self.midterm)
+        self.assertEqual(
+            (grade.score, grade.normalized_score, grade.remarks),
+            (Decimal('15.50'), Decimal('15.50'), 'Rattrapage')
+        )
+        absent = Grade.objects.get(student=self.other_student, exam=self.midterm)
+        self.assertEqual((absent.score, absent.is_absent), (Decimal('0.00'), True))
+
+        final_score = baseline_final_score([
+            (Decimal('15.50'), False, Decimal('20.00'), Decimal('0.40')),
+            (Decimal('30.00'), False, Decimal('40.00'), Decimal('0.60')),
+        ])
+        self.assertEqual(
+            CourseGrade.objects.get(student=self.student, course=self.course).final_score,
+            final_score
+        )
+        self.assertEqual(
+            CourseGrade.objects.get(student=self.other_student, course=self.course).final_score,
+            Decimal('0.00')
+        )
+        report_card = ReportCard.objects.get(student=self.student, semester=self.semester)
+        self.assertEqual(
+            (report_card.gpa, report_card.total_credits, report_card.credits_earned),
+            baseline_gpa([(final_score, self.course.credits)])
+        )
+
+
+class GradeCreateSerializerTests(_GradeWriteFixture, TestCase):
+    """Tests for the unique constraint handling of GradeCreateSerializer."""
+
+    def _save(self, score):
+        serializer = GradeCreateSerializer(data={
+            'student': self.student.id, 'exam': self.midterm.id, 'score': score,
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(graded_by=self.admin_user)
+
+    def test_duplicate_is_a_validation_error(self):
+        """Test that a second grade for the student and exam is rejected."""
+        self._save('12.00')
+
+        with self.assertRaises(serializers.ValidationError) as raised:
+            self._save('15.00')
+
+        self.assertIn('student', raised.exception.detail)
+
+    def test_other_integrity_errors_are_raised(self):
+        """Test that an integrity error other than a duplicate propagates."""
+        with mock.patch.object(
+            serializers.ModelSerializer, 'create', side_effect=IntegrityError('NOT NULL')
+        ):
+            with self.assertRaises(IntegrityError):
+                self._save('12.00')
+
+
+class GradeSignalTests(_GradeWriteFixture, TestCase):
+    """Tests for the course grade recalculation queued by the Grade signals."""
+
+    def test_recalculates_each_course_grade_once_at_commit(self):
+        """Test that grade saves in a transaction share one recalculation."""
+        with mock.patch.object(
+            signals, 'recalculate_course_grades', wraps=signals.recalculate_course_grades
+        ) as recalculate:
+            with self.captureOnCommitCallbacks(execute=True):
+                Grade.objects.create(
+                    student=self.student, exam=self.midterm, score=Decimal('13.50')
+                )
+                grade = Grade.objects.create(
+                    student=self.student, exam=self.final, score=Decimal('20.00')
+                )
+                grade.score = Decimal('27.25')
+                grade.save()
+
+                # Deferred to the commit
+                self.assertFalse(CourseGrade.objects.exists())
+
+        recalculate.assert_called_once()
+        self.assertEqual(
+            set(recalculate.call_args.args[0]),
+            {(self.student.id, self.course.id, self.semester.id)}
+        )
+        self.assertEqual(
+            CourseGrade.objects.get(student=self.student, course=self.course).final_score,
+            baseline_final_score([
+                (Decimal('13.50'), False, Decimal('20.00'), Decimal('0.40')),
+                (Decimal('27.25'), False, Decimal('40.00'), Decimal('0.60')),
+            ])
+        )
+
+    def test_delete_reads_only_the_exam_keys(self):
+        """Test that a grade whose exam isn't loaded doesn't fetch the Exam row."""
+        build_grade(student=self.student, exam=self.midterm, score=Decimal('12.00'))
+        grade = Grade.objects.get(student=self.student, exam=self.midterm)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                grade.delete()
+
+        self.assertFalse([
+            query for query in queries if '"academics_exam"."max_score"' in query['sql']
+        ])
+        self.assertEqual(
+            CourseGrade.objects.filter(student=self.student, course=self.course).count(), 0
+        )
+
+    def test_defer_block_recalculates_on_exit(self):
+        """Test that defer_course_grade_recalculation() updates before the commit."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with signals.defer_course_grade_recalculation():
+                Grade.objects.create(
+                    student=self.student, exam=self.midterm, score=Decimal('7.00')
+                )
+                Grade.objects.create(
+                    student=self.other_student, exam=self.midterm, score=Decimal('15.00')
+                )
+
+            self.assertEqual(
+                dict(CourseGrade.objects.values_list('student', 'final_score')),
+                {self.student.id: Decimal('7.00'), self.other_student.id: Decimal('15.00')}
+            )
+
+        # Only the report card refresh is left for the commit
+        self.assertEqual(callbacks, [signals._refresh_pending_report_cards])
+
+
+class CourseGradeCreditsTests(_GradeWriteFixture, TestCase):
+    """Tests for the copy of the course credits on CourseGrade."""
+
+    def _create(self, course):
+        return CourseGrade.objects.create(
+            student=self.student,
+            course=course,
+            semester=self.semester,
+            final_score=Decimal('12.00')
+        )
+
+    def test_copied_on_create_and_course_change(self):
+        """Test that course_credits follows the course of the grade."""
+        course_grade = self._create(self.course)
+        self.assertEqual(course_grade.course_credits, 3)
+
+        course_grade.course = self.other_course
+        course_grade.save()
+        course_grade.refresh_from_db()
+        self.assertEqual(course_grade.course_credits, 2)
+
+    def test_save_does_not_load_the_course(self):
+        """Test that saving a loaded course grade doesn't query its course."""
+        self._create(self.course)
+        course_grade = CourseGrade.objects.get(student=self.student, course=self.course)
+        course_grade.final_score = Decimal('16.00')
+
+        with CaptureQueriesContext(connection) as queries:
+            course_grade.save()
+
+        self.assertFalse([
+            query for query in queries if 'FROM "academics_course"' in query['sql']
+        ])
+        self.assertEqual(course_grade.grade_letter, 'A')
+
+    def test_synced_on_course_credits_change(self):
+        """Test that changing the course credits updates its course grades."""
+        course_grade = self._create(self.course)
+
+        self.course.credits = 5
+        self.course.save()
+
+        course_grade.refresh_from_db()
+        self.assertEqual(course_grade.course_credits, 5)
+
+
+class ReportCardGpaTests(_GradeWriteFixture, TestCase):
+    """Tests for the report card averages against the original formula."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        super().setUpTestData()
+        cls.third_course = Course.objects.create(
+            name='Physics', code='PH101', program=cls.program, credits=1, level=cls.level
+        )
+        # (student, {course: final_score}); 7203 hundredths over 6 credits
+        # is a tie at 12.005 for the first student
+        cls.final_scores = {
+            cls.student: {cls.course: '12.01', cls.other_course: '12.00', cls.third_course: '12.00'},
+            cls.other_student: {cls.course: '9.99', cls.other_course: '15.35', cls.third_course: '10.00'},
+        }
+        CourseGrade.objects.bulk_create([
+            CourseGrade(
+                student=student,
+                course=course,
+                semester=cls.semester,
+                final_score=Decimal(final_score),
+                course_credits=course.credits
+            )
+            for student, scores in cls.final_scores.items()
+            for course, final_score in scores.items()
+        ])
+        ReportCard.objects.bulk_create([
+            ReportCard(student=student, semester=cls.semester) for student in cls.final_scores
+        ])
+
+    def assertBaselineTotals(self):
+        for student, scores in self.final_scores.items():
+            report_card = ReportCard.objects.get(student=student, semester=self.semester)
+            self.assertEqual(
+                (report_card.gpa, report_card.total_credits, report_card.credits_earned),
+                baseline_gpa([
+                    (Decimal(final_score), course.credits)
+                    for course, final_score in scores.items()
+                ])
+            )
+            self.assertEqual(report_card.course_grades_count, 3)
+
+    def test_recalculate_for_semester(self):
+        """Test the single UPDATE recalculation."""
+        self.assertEqual(ReportCard.recalculate_for_semester(self.semester), 2)
+        self.assertBaselineTotals()
+
+    def test_recalculate_for_students(self):
+        """Test the grouped aggregate recalculation."""
+        ReportCard.recalculate_for_students(
+            (student.id, self.semester.id) for student in self.final_scores
+        )
+        self.assertBaselineTotals()
+
+    def test_calculate_gpa(self):
+        """Test the recalculation of a single report card."""
+        for report_card in ReportCard.objects.all():
+            report_card.calculate_gpa()
+        self.assertBaselineTotals()
+
+
+class GradeAutocommitTests(_GradeWriteFixture, TransactionTestCase):
+    """Tests for the Grade signals outside a transaction."""
+
+    def setUp(self):
+        self.create_fixture()
+
+    def test_save_recalculates_immediately(self):
+        """Test that a save in autocommit mode refreshes the course grade and report card."""
+        ReportCard.objects.create(student=self.student, semester=self.semester)
+
+        Grade.objects.create(student=self.student, exam=self.midterm, score=Decimal('13.50'))
+        Grade.objects.create(student=self.student, exam=self.final, score=Decimal('27.25'))
+
+        final_score = baseline_final_score([
+            (Decimal('13.50'), False, Decimal('20.00'), Decimal('0.40')),
+            (Decimal('27.25'), False, Decimal('40.00'), Decimal('0.60')),
+        ])
+        self.assertEqual(
+            CourseGrade.objects.get(student=self.student, course=self.course).final_score,
+            final_score
+        )
+        report_card = ReportCard.objects.get(student=self.student, semester=self.semester)
+        self.assertEqual(
+            (report_card.gpa, report_card.total_credits, report_card.credits_earned),
+            baseline_gpa([(final_score, self.course.credits)])
+        )
+        self.assertEqual(report_card.course_grades_count, 1)
@@ -4,13 +4,15 @@ Property-based tests for academics serializers.
 These tests verify universal properties that should hold for all valid inputs.
 """
 
-from hypothesis import given, strategies as st, settings
-from hypothesis.extra.django import TestCase
+from hypothesis import Phase, given, strategies as st, settings
+from hypothesis.extra.django import SimpleTestCase, TestCase
+from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from django.utils import timezone
+from django.contrib.auth.hashers import make_password
+from django.db.models import prefetch_related_objects
 from datetime import date, timedelta, time
 from decimal import Decimal
-import uuid
+import itertools
 from apps.academics.serializers import (
     CourseListSerializer,
     CourseDetailSerializer,
@@ -27,76 +29,185 @@ from apps.academics.serializers import (
     ReportCardListSerializer,
     ReportCardDetailSerializer,
 )
-from apps.academics.models import Course, Exam, Grade, CourseGrade, ReportCard
+from apps.academics.models import (
+    Course, Exam, Grade, CourseGrade, ReportCard, grade_letter_for
+)
 from apps.university.models import (
     AcademicYear, Semester, Faculty, Department, Level, Program, Classroom
 )
 from apps.students.models import Student
+from apps.core.prefetch import apply_prefetch
+from apps.academics.tests.helpers import build_grade
 
 User = get_user_model()
 
+# Strategies shared by the @given decorators below, built once at import.
+_UPPER_LOWER_SPACE = st.characters(whitelist_categories=('Lu', 'Ll', 'Zs'))
+_CODE_ALPHABET = st.characters(whitelist_categories=('Lu', 'Nd'))
+_COURSE_NAME = st.text(min_size=5, max_size=50, alphabet=_UPPER_LOWER_SPACE)
+_COURSE_CODE = st.text(min_size=2, max_size=10, alphabet=_CODE_ALPHABET)
+_COURSE_TYPE_VALUES = Course.CourseType.values
+_EXAM_TYPE_VALUES = Exam.ExamType.values
+_COURSE_TYPES = st.sampled_from(_COURSE_TYPE_VALUES)
+_EXAM_TYPES = st.sampled_from(_EXAM_TYPE_VALUES)
+_SCORE_VALID = st.decimals(min_value=0, max_value=20, places=2)
+# Grade letters only change at the cutoffs (10, 12, 14, 16): scores on either
+# side of each one, mixed with random interior values
+_SCORE_BIN_EDGES = [
+    score
+    for cutoff in (10, 12, 14, 16)
+    for score in (Decimal(cutoff) - Decimal('0.01'), Decimal(cutoff))
+]
+_SCORE_AROUND_CUTOFFS = st.one_of(st.sampled_from(_SCORE_BIN_EDGES), _SCORE_VALID)
 
-class CourseSerializerPropertyTests(TestCase):
-    """Property tests for Course serializers."""
-    
-    def setUp(self):
+# Fields each serializer must expose, checked with one subset assertion
+_COURSE_LIST_FIELDS = frozenset({
+    'program_name', 'program_code', 'course_type_display', 'semester_type_display',
+})
+_COURSE_DETAIL_FIELDS = frozenset({'department_name', 'faculty_name', 'level_display'})
+_COURSE_COMPUTED_FIELDS = frozenset({
+    'total_hours', 'exams_count', 'students_count', 'prerequisites_count',
+})
+_EXAM_LIST_FIELDS = frozenset({
+    'course_name', 'course_code', 'exam_type_display', 'semester_name',
+    'classroom_name',
+})
+_EXAM_DETAIL_FIELDS = frozenset({
+    'program_name', 'academic_year', 'classroom_capacity', 'grades_count',
+})
+_GRADE_LIST_FIELDS = frozenset({
+    'student_name', 'student_matricule', 'course_name', 'course_code',
+    'exam_type_display', 'graded_by_name',
+})
+_GRADE_DETAIL_FIELDS = frozenset({
+    'student_program', 'exam_date', 'exam_max_score', 'exam_weight',
+})
+_COURSE_GRADE_LIST_FIELDS = frozenset({
+    'student_name', 'student_matricule', 'course_name', 'course_code', 'semester_name',
+})
+_COURSE_GRADE_DETAIL_FIELDS = frozenset({
+    'student_program', 'course_credits', 'course_coefficient', 'academic_year',
+})
+_REPORT_CARD_LIST_FIELDS = frozenset({
+    'student_name', 'student_matricule', 'program_name', 'semester_name',
+    'academic_year', 'generated_by_name',
+})
+_REPORT_CARD_DETAIL_FIELDS = frozenset({
+    'student_email', 'student_program', 'program_code', 'student_level',
+    'course_grades_count',
+})
+
+# Examples hitting the database have no deadline: their time depends on the
+# host's I/O, not on the input
+_DB_EXAMPLES = settings(deadline=None)
+
+# Suffixes keeping usernames and codes unique; parallel workers each have
+# their own database clone, so a per-process counter is enough
+_UNIQUE_IDS = itertools.count()
+
+
+def load_for_serializer(serializer_class, instance):
+    """
+    Reload an instance the way the viewsets do, with the related objects and
+    annotations declared on the serializer's Meta, so serializing it doesn't
+    issue one query per related name or count.
+    """
+    queryset = type(instance).objects.filter(pk=instance.pk)
+    return apply_prefetch(queryset, serializer_class).get()
+
+
+class _AcademicsFixture:
+    """
+    Fixture graph shared by the serializer property tests: a dean (plus
+    ``extra_users``), faculty, department, level, program, academic year and
+    semester, created once per class.
+    """
+
+    # Distinguishes the usernames created by each class
+    user_prefix = None
+    # Users created besides the dean: 'teacher_user' and/or 'student_user'
+    extra_users = ()
+
+    USERS = {
+        'dean': ('dean', User.Role.ADMIN, 'Dean'),
+        'teacher_user': ('teacher', User.Role.TEACHER, 'Teacher'),
+        'student_user': ('student', User.Role.STUDENT, 'Student'),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
+        super().setUpTestData()
         # Create users with unique usernames
-        unique_id = str(uuid.uuid4())[:8]
-        self.dean = User.objects.create_user(
-            username=f'dean_course_{unique_id}',
-            email=f'dean_course_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.ADMIN,
-            first_name='Dean',
-            last_name='Test'
-        )
+        cls.unique_id = unique_id = f'{next(_UNIQUE_IDS):08x}'
+        password = make_password('testpass123')
+        attrs = ('dean',) + tuple(cls.extra_users)
+        users = User.objects.bulk_create([
+            User(
+                username=f'{name}_{cls.user_prefix}_{unique_id}',
+                email=f'{name}_{cls.user_prefix}_{unique_id}@test.com',
+                password=password,
+                role=role,
+                first_name=first_name,
+                last_name='Test',
+            )
+            for name, role, first_name in (cls.USERS[attr] for attr in attrs)
+        ])
+        for attr, user in zip(attrs, users):
+            setattr(cls, attr, user)
+            # Expected *_name values, e.g. cls.student_full_name
+            setattr(cls, f'{cls.USERS[attr][0]}_full_name', user.get_full_name())
         
         # Create faculty and department
-        self.faculty = Faculty.objects.create(
+        cls.faculty = Faculty.objects.create(
             name='Test Faculty',
             code=f'TF{unique_id}',
-            dean=self.dean
+            dean=cls.dean
         )
-        self.department = Department.objects.create(
+        cls.department = Department.objects.create(
             name='Test Department',
             code=f'TD{unique_id}',
-            faculty=self.faculty,
-            head=self.dean
+            faculty=cls.faculty,
+            head=cls.dean
         )
         
         # Create level and program
-        self.level, _ = Level.objects.get_or_create(name='L1', defaults={'order': 1})
-        self.program = Program.objects.create(
+        cls.level, _ = Level.objects.get_or_create(name='L1', defaults={'order': 1})
+        cls.program = Program.objects.create(
             name='Test Program',
             code=f'TP{unique_id}',
-            department=self.department,
-            level=self.level,
+            department=cls.department,
             duration_years=3
         )
+        cls.program.levels.add(cls.level)
         
         # Create academic year and semester
-        self.academic_year = AcademicYear.objects.create(
+        cls.academic_year = AcademicYear.objects.create(
             name=f'2023-2024-{unique_id}',
             start_date=date(2023, 9, 1),
             end_date=date(2024, 6, 30),
             is_current=False
         )
-        self.semester = Semester.objects.create(
-            academic_year=self.academic_year,
+        cls.semester = Semester.objects.create(
+            academic_year=cls.academic_year,
             semester_type='FALL',
             start_date=date(2023, 9, 1),
             end_date=date(2024, 1, 31),
             is_current=False
         )
 
+
+class CourseSerializerPropertyTests(_AcademicsFixture, TestCase):
+    """Property tests for Course serializers."""
+
+    user_prefix = 'course'
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        course_name=st.text(min_size=5, max_size=50, alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Zs'))),
-        course_code=st.text(min_size=2, max_size=10, alphabet=st.characters(whitelist_categories=('Lu', 'Nd'))),
+        course_name=_COURSE_NAME,
+        course_code=_COURSE_CODE,
         credits=st.integers(min_value=1, max_value=10),
-        course_type=st.sampled_from([choice[0] for choice in Course.CourseType.choices]),
+        course_type=_COURSE_TYPES,
     )
     def test_property_1_foreign_key_representation(self, course_name, course_code, credits, course_type):
         """
@@ -115,18 +226,15 @@ class CourseSerializerPropertyTests(TestCase):
             program=self.program,
             course_type=course_type,
             credits=credits,
-            semester=self.semester
+            level=self.level
         )
         
         # Test list serializer
-        list_serializer = CourseListSerializer(course)
+        list_serializer = CourseListSerializer(load_for_serializer(CourseListSerializer, course))
         list_data = list_serializer.data
         
         # Verify readable representations are included
-        self.assertIn('program_name', list_data)
-        self.assertIn('program_code', list_data)
-        self.assertIn('course_type_display', list_data)
-        self.assertIn('semester_name', list_data)
+        self.assertLessEqual(_COURSE_LIST_FIELDS, list_data.keys())
         
         # Verify values are correct
         self.assertEqual(list_data['program_name'], self.program.name)
@@ -134,18 +242,16 @@ class CourseSerializerPropertyTests(TestCase):
         self.assertEqual(list_data['course_type_display'], course.get_course_type_display())
         
         # Test detail serializer
-        detail_serializer = CourseDetailSerializer(course)
+        detail_serializer = CourseDetailSerializer(load_for_serializer(CourseDetailSerializer, course))
         detail_data = detail_serializer.data
         
         # Verify additional readable representations in detail view
-        self.assertIn('department_name', detail_data)
-        self.assertIn('faculty_name', detail_data)
-        self.assertIn('academic_year', detail_data)
+        self.assertLessEqual(_COURSE_DETAIL_FIELDS, detail_data.keys())
 
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=3, phases=[Phase.generate])
     @given(
-        course_code=st.text(min_size=2, max_size=10, alphabet=st.characters(whitelist_categories=('Lu', 'Nd'))),
+        course_code=_COURSE_CODE,
     )
     def test_property_2_validation_enforcement_duplicate_code(self, course_code):
         """
@@ -184,10 +290,10 @@ class CourseSerializerPropertyTests(TestCase):
         self.assertIn('code', serializer.errors)
 
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        course_name=st.text(min_size=5, max_size=50, alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Zs'))),
-        course_code=st.text(min_size=2, max_size=10, alphabet=st.characters(whitelist_categories=('Lu', 'Nd'))),
+        course_name=_COURSE_NAME,
+        course_code=_COURSE_CODE,
         credits=st.integers(min_value=1, max_value=10),
     )
     def test_property_3_computed_properties_inclusion(self, course_name, course_code, credits):
@@ -211,94 +317,49 @@ class CourseSerializerPropertyTests(TestCase):
         )
         
         # Serialize with detail serializer
-        serializer = CourseDetailSerializer(course)
+        serializer = CourseDetailSerializer(load_for_serializer(CourseDetailSerializer, course))
         data = serializer.data
         
         # Verify computed properties are included
-        self.assertIn('total_hours', data)
-        self.assertIn('exams_count', data)
-        self.assertIn('students_count', data)
-        self.assertIn('prerequisites_count', data)
+        self.assertLessEqual(_COURSE_COMPUTED_FIELDS, data.keys())
         
         # Verify computed values are correct
         self.assertEqual(data['total_hours'], course.total_hours)
-        self.assertEqual(data['exams_count'], course.exams.count())
-        self.assertEqual(data['prerequisites_count'], course.prerequisites.count())
+        prefetch_related_objects([course], 'exams', 'prerequisites')
+        self.assertEqual(data['exams_count'], len(course.exams.all()))
+        self.assertEqual(data['prerequisites_count'], len(course.prerequisites.all()))
 
 
-class ExamSerializerPropertyTests(TestCase):
+class ExamSerializerPropertyTests(_AcademicsFixture, TestCase):
     """Property tests for Exam serializers."""
+
+    user_prefix = 'exam'
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        # Create users with unique usernames
-        unique_id = str(uuid.uuid4())[:8]
-        self.dean = User.objects.create_user(
-            username=f'dean_exam_{unique_id}',
-            email=f'dean_exam_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.ADMIN,
-            first_name='Dean',
-            last_name='Test'
-        )
-        
-        # Create faculty and department
-        self.faculty = Faculty.objects.create(
-            name='Test Faculty',
-            code=f'TF{unique_id}',
-            dean=self.dean
-        )
-        self.department = Department.objects.create(
-            name='Test Department',
-            code=f'TD{unique_id}',
-            faculty=self.faculty,
-            head=self.dean
-        )
-        
-        # Create level and program
-        self.level, _ = Level.objects.get_or_create(name='L1', defaults={'order': 1})
-        self.program = Program.objects.create(
-            name='Test Program',
-            code=f'TP{unique_id}',
-            department=self.department,
-            level=self.level,
-            duration_years=3
-        )
-        
-        # Create academic year and semester
-        self.academic_year = AcademicYear.objects.create(
-            name=f'2023-2024-{unique_id}',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        self.semester = Semester.objects.create(
-            academic_year=self.academic_year,
-            semester_type='FALL',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=False
-        )
+        super().setUpTestData()
+        unique_id = cls.unique_id
         
         # Create course
-        self.course = Course.objects.create(
+        cls.course = Course.objects.create(
             name='Test Course',
             code=f'TC{unique_id}',
-            program=self.program,
+            program=cls.program,
             credits=3
         )
         
         # Create classroom
-        self.classroom = Classroom.objects.create(
+        cls.classroom = Classroom.objects.create(
             name='Room 101',
             code=f'R101{unique_id}',
             capacity=50
         )
 
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        exam_type=st.sampled_from([choice[0] for choice in Exam.ExamType.choices]),
+        exam_type=_EXAM_TYPES,
         max_score=st.decimals(min_value=10, max_value=100, places=2),
         weight=st.decimals(min_value=Decimal('0.1'), max_value=Decimal('1.0'), places=2),
     )
@@ -325,15 +386,11 @@ class ExamSerializerPropertyTests(TestCase):
         )
         
         # Test list serializer
-        list_serializer = ExamListSerializer(exam)
+        list_serializer = ExamListSerializer(load_for_serializer(ExamListSerializer, exam))
         list_data = list_serializer.data
         
         # Verify readable representations are included
-        self.assertIn('course_name', list_data)
-        self.assertIn('course_code', list_data)
-        self.assertIn('exam_type_display', list_data)
-        self.assertIn('semester_name', list_data)
-        self.assertIn('classroom_name', list_data)
+        self.assertLessEqual(_EXAM_LIST_FIELDS, list_data.keys())
         
         # Verify values are correct
         self.assertEqual(list_data['course_name'], self.course.name)
@@ -342,85 +399,17 @@ class ExamSerializerPropertyTests(TestCase):
         self.assertEqual(list_data['classroom_name'], self.classroom.name)
         
         # Test detail serializer
-        detail_serializer = ExamDetailSerializer(exam)
+        detail_serializer = ExamDetailSerializer(load_for_serializer(ExamDetailSerializer, exam))
         detail_data = detail_serializer.data
         
         # Verify additional readable representations in detail view
-        self.assertIn('program_name', detail_data)
-        self.assertIn('academic_year', detail_data)
-        self.assertIn('classroom_capacity', detail_data)
-        self.assertIn('grades_count', detail_data)
+        self.assertLessEqual(_EXAM_DETAIL_FIELDS, detail_data.keys())
 
     
-    @settings(max_examples=10)
+    # One example per exam type is all the input space there is
+    @settings(_DB_EXAMPLES, max_examples=len(_EXAM_TYPE_VALUES))
     @given(
-        days_offset=st.integers(min_value=1, max_value=30)
-    )
-    def test_property_2_validation_enforcement_invalid_time_range(self, days_offset):
-        """
-        Feature: backend-api-implementation, Property 2: Validation Enforcement
-        
-        **Validates: Requirements 1.9**
-        
-        For any invalid input data that violates model constraints or business rules,
-        the serializer should reject it and return detailed validation errors.
-        
-        Test case: End time must be after start time.
-        """
-        # Try to create exam with invalid time range (end before start)
-        data = {
-            'course': self.course.id,
-            'exam_type': 'MIDTERM',
-            'semester': self.semester.id,
-            'date': (date(2023, 9, 1) + timedelta(days=days_offset)).isoformat(),
-            'start_time': '11:00:00',
-            'end_time': '09:00:00',  # Before start time
-            'max_score': '20.00',
-            'weight': '1.00'
-        }
-        
-        serializer = ExamCreateSerializer(data=data)
-        
-        # Should be invalid due to invalid time range
-        is_valid = serializer.is_valid()
-        self.assertFalse(is_valid)
-        
-        # Should have end_time error
-        self.assertIn('end_time', serializer.errors)
-    
-    @settings(max_examples=10)
-    def test_property_2_validation_enforcement_date_outside_semester(self):
-        """
-        Feature: backend-api-implementation, Property 2: Validation Enforcement
-        
-        **Validates: Requirements 1.9**
-        
-        Test case: Exam date must be within semester dates.
-        """
-        # Try to create exam with date outside semester
-        data = {
-            'course': self.course.id,
-            'exam_type': 'FINAL',
-            'semester': self.semester.id,
-            'date': '2024-06-01',  # Outside semester range
-            'start_time': '09:00:00',
-            'end_time': '11:00:00',
-            'max_score': '20.00',
-            'weight': '1.00'
-        }
-        
-        serializer = ExamCreateSerializer(data=data)
-        
-        # Should be invalid due to date outside semester
-        is_valid = serializer.is_valid()
-        self.assertFalse(is_valid)
-        
-        # Should have date error
-        self.assertIn('date', serializer.errors)
-    
-    @settings(max_examples=10)
-    @given(
-        exam_type=st.sampled_from([choice[0] for choice in Exam.ExamType.choices]),
+        exam_type=_EXAM_TYPES,
     )
     def test_property_3_computed_properties_inclusion(self, exam_type):
         """
@@ -445,93 +434,119 @@ class ExamSerializerPropertyTests(TestCase):
         )
         
         # Serialize with detail serializer
-        serializer = ExamDetailSerializer(exam)
+        serializer = ExamDetailSerializer(load_for_serializer(ExamDetailSerializer, exam))
         data = serializer.data
         
         # Verify computed properties are included
         self.assertIn('grades_count', data)
         
         # Verify computed values are correct
-        self.assertEqual(data['grades_count'], exam.grades.count())
+        prefetch_related_objects([exam], 'grades')
+        self.assertEqual(data['grades_count'], len(exam.grades.all()))
 
 
 
-class GradeSerializerPropertyTests(TestCase):
-    """Property tests for Grade serializers."""
-    
+class ExamValidationTests(SimpleTestCase):
+    """
+    Business rules of ExamCreateSerializer.validate() checked on in-memory
+    instances, without touching the database.
+    """
+
     def setUp(self):
-        """Set up test data."""
-        # Create users with unique usernames
-        unique_id = str(uuid.uuid4())[:8]
-        self.dean = User.objects.create_user(
-            username=f'dean_grade_{unique_id}',
-            email=f'dean_grade_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.ADMIN,
-            first_name='Dean',
-            last_name='Test'
+        """Set up unsaved related objects."""
+        self.semester = Semester(
+            semester_type='S1',
+            start_date=date(2023, 9, 1),
+            end_date=date(2024, 1, 31),
         )
+        self.course = Course(name='Test Course', code='TC101')
+
+    def exam_attrs(self, **overrides):
+        attrs = {
+            'course': self.course,
+            'exam_type': 'MIDTERM',
+            'semester': self.semester,
+            'date': date(2023, 10, 1),
+            'start_time': time(9, 0),
+            'end_time': time(11, 0),
+            'max_score': Decimal('20.00'),
+            'weight': Decimal('1.00'),
+        }
+        attrs.update(overrides)
+        return attrs
+
+    @settings(max_examples=3, phases=[Phase.generate], deadline=None)
+    @given(
+        days_offset=st.integers(min_value=1, max_value=30)
+    )
+    def test_property_2_validation_enforcement_invalid_time_range(self, days_offset):
+        """
+        Feature: backend-api-implementation, Property 2: Validation Enforcement
         
-        self.teacher_user = User.objects.create_user(
-            username=f'teacher_grade_{unique_id}',
-            email=f'teacher_grade_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.TEACHER,
-            first_name='Teacher',
-            last_name='Test'
-        )
+        **Validates: Requirements 1.9**
         
-        # Create faculty and department
-        self.faculty = Faculty.objects.create(
-            name='Test Faculty',
-            code=f'TF{unique_id}',
-            dean=self.dean
-        )
-        self.department = Department.objects.create(
-            name='Test Department',
-            code=f'TD{unique_id}',
-            faculty=self.faculty,
-            head=self.dean
-        )
+        For any invalid input data that violates model constraints or business rules,
+        the serializer should reject it and return detailed validation errors.
         
-        # Create level and program
-        self.level, _ = Level.objects.get_or_create(name='L1', defaults={'order': 1})
-        self.program = Program.objects.create(
-            name='Test Program',
-            code=f'TP{unique_id}',
-            department=self.department,
-            level=self.level,
-            duration_years=3
+        Test case: End time must be after start time.
+        """
+        attrs = self.exam_attrs(
+            date=date(2023, 9, 1) + timedelta(days=days_offset),
+            start_time=time(11, 0),
+            end_time=time(9, 0),  # Before start time
         )
+
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            ExamCreateSerializer().validate(attrs)
+
+        # Should have end_time error
+        self.assertIn('end_time', ctx.exception.detail)
+
+    def test_property_2_validation_enforcement_date_outside_semester(self):
+        """
+        Feature: backend-api-implementation, Property 2: Validation Enforcement
         
-        # Create academic year and semester
-        self.academic_year = AcademicYear.objects.create(
-            name=f'2023-2024-{unique_id}',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        self.semester = Semester.objects.create(
-            academic_year=self.academic_year,
-            semester_type='FALL',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=False
+        **Validates: Requirements 1.9**
+        
+        Test case: Exam date must be within semester dates.
+        """
+        attrs = self.exam_attrs(
+            exam_type='FINAL',
+            date=date(2024, 6, 1),  # Outside semester range
         )
+
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            ExamCreateSerializer().validate(attrs)
+
+        # Should have date error
+        self.assertIn('date', ctx.exception.detail)
+
+
+class GradeSerializerPropertyTests(_AcademicsFixture, TestCase):
+    """Property tests for Grade serializers."""
+
+    user_prefix = 'grade'
+    extra_users = ('teacher_user', 'student_user')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        super().setUpTestData()
+        unique_id = cls.unique_id
         
         # Create course
-        self.course = Course.objects.create(
+        cls.course = Course.objects.create(
             name='Test Course',
             code=f'TC{unique_id}',
-            program=self.program,
+            program=cls.program,
             credits=3
         )
         
         # Create exam
-        self.exam = Exam.objects.create(
-            course=self.course,
+        cls.exam = Exam.objects.create(
+            course=cls.course,
             exam_type='MIDTERM',
-            semester=self.semester,
+            semester=cls.semester,
             date=date(2023, 10, 15),
             start_time=time(9, 0),
             end_time=time(11, 0),
@@ -540,26 +555,18 @@ class GradeSerializerPropertyTests(TestCase):
         )
         
         # Create student
-        self.student_user = User.objects.create_user(
-            username=f'student_grade_{unique_id}',
-            email=f'student_grade_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.STUDENT,
-            first_name='Student',
-            last_name='Test'
-        )
-        self.student = Student.objects.create(
-            user=self.student_user,
+        cls.student = Student.objects.create(
+            user=cls.student_user,
             student_id=f'STU{unique_id}',
-            program=self.program,
-            current_level=self.level,
+            program=cls.program,
+            current_level=cls.level,
             enrollment_date=date.today()
         )
 
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        score=st.decimals(min_value=0, max_value=20, places=2),
+        score=_SCORE_VALID,
         is_absent=st.booleans(),
     )
     def test_property_1_foreign_key_representation(self, score, is_absent):
@@ -572,7 +579,7 @@ class GradeSerializerPropertyTests(TestCase):
         the output should include readable representations of the related objects.
         """
         # Create grade
-        grade = Grade.objects.create(
+        grade = build_grade(
             student=self.student,
             exam=self.exam,
             score=score if not is_absent else Decimal('0.00'),
@@ -581,69 +588,29 @@ class GradeSerializerPropertyTests(TestCase):
         )
         
         # Test list serializer
-        list_serializer = GradeListSerializer(grade)
+        list_serializer = GradeListSerializer(load_for_serializer(GradeListSerializer, grade))
         list_data = list_serializer.data
         
         # Verify readable representations are included
-        self.assertIn('student_name', list_data)
-        self.assertIn('student_matricule', list_data)
-        self.assertIn('course_name', list_data)
-        self.assertIn('course_code', list_data)
-        self.assertIn('exam_type_display', list_data)
-        self.assertIn('graded_by_name', list_data)
+        self.assertLessEqual(_GRADE_LIST_FIELDS, list_data.keys())
         
         # Verify values are correct
-        self.assertEqual(list_data['student_name'], self.student.user.get_full_name())
+        self.assertEqual(list_data['student_name'], self.student_full_name)
         self.assertEqual(list_data['student_matricule'], self.student.student_id)
         self.assertEqual(list_data['course_name'], self.course.name)
-        self.assertEqual(list_data['graded_by_name'], self.teacher_user.get_full_name())
+        self.assertEqual(list_data['graded_by_name'], self.teacher_full_name)
         
         # Test detail serializer
-        detail_serializer = GradeDetailSerializer(grade)
+        detail_serializer = GradeDetailSerializer(load_for_serializer(GradeDetailSerializer, grade))
         detail_data = detail_serializer.data
         
         # Verify additional readable representations in detail view
-        self.assertIn('student_program', detail_data)
-        self.assertIn('exam_date', detail_data)
-        self.assertIn('exam_max_score', detail_data)
-        self.assertIn('exam_weight', detail_data)
+        self.assertLessEqual(_GRADE_DETAIL_FIELDS, detail_data.keys())
 
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=3, phases=[Phase.generate])
     @given(
-        score=st.decimals(min_value=20.01, max_value=30, places=2),
-    )
-    def test_property_2_validation_enforcement_score_exceeds_max(self, score):
-        """
-        Feature: backend-api-implementation, Property 2: Validation Enforcement
-        
-        **Validates: Requirements 1.9**
-        
-        For any invalid input data that violates model constraints or business rules,
-        the serializer should reject it and return detailed validation errors.
-        
-        Test case: Score cannot exceed exam's max_score.
-        """
-        # Try to create grade with score exceeding max_score
-        data = {
-            'student': self.student.id,
-            'exam': self.exam.id,
-            'score': str(score),
-            'graded_by': self.teacher_user.id
-        }
-        
-        serializer = GradeCreateSerializer(data=data)
-        
-        # Should be invalid due to score exceeding max_score
-        is_valid = serializer.is_valid()
-        self.assertFalse(is_valid)
-        
-        # Should have score error
-        self.assertIn('score', serializer.errors)
-    
-    @settings(max_examples=10)
-    @given(
-        score=st.decimals(min_value=0, max_value=20, places=2),
+        score=_SCORE_VALID,
     )
     def test_property_2_validation_enforcement_duplicate_grade(self, score):
         """
@@ -654,7 +621,7 @@ class GradeSerializerPropertyTests(TestCase):
         Test case: Duplicate grade for same student and exam should be rejected.
         """
         # Create a grade
-        Grade.objects.create(
+        build_grade(
             student=self.student,
             exam=self.exam,
             score=score,
@@ -670,17 +637,18 @@ class GradeSerializerPropertyTests(TestCase):
         }
         
         serializer = GradeCreateSerializer(data=data)
+        self.assertTrue(serializer.is_valid())
         
-        # Should be invalid due to duplicate grade
-        is_valid = serializer.is_valid()
-        self.assertFalse(is_valid)
+        # Should be rejected on save by the unique constraint
+        with self.assertRaises(serializers.ValidationError) as context:
+            serializer.save()
         
         # Should have student error
-        self.assertIn('student', serializer.errors)
+        self.assertIn('student', context.exception.detail)
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        score=st.decimals(min_value=0, max_value=20, places=2),
+        score=_SCORE_VALID,
     )
     def test_property_3_computed_properties_inclusion(self, score):
         """
@@ -692,7 +660,7 @@ class GradeSerializerPropertyTests(TestCase):
         those properties as read-only fields in the output.
         """
         # Create grade
-        grade = Grade.objects.create(
+        grade = build_grade(
             student=self.student,
             exam=self.exam,
             score=score,
@@ -700,7 +668,7 @@ class GradeSerializerPropertyTests(TestCase):
         )
         
         # Serialize with detail serializer
-        serializer = GradeDetailSerializer(grade)
+        serializer = GradeDetailSerializer(load_for_serializer(GradeDetailSerializer, grade))
         data = serializer.data
         
         # Verify computed properties are included
@@ -712,98 +680,72 @@ class GradeSerializerPropertyTests(TestCase):
 
 
 
-class CourseGradeSerializerPropertyTests(TestCase):
-    """Property tests for CourseGrade serializers."""
-    
-    def setUp(self):
-        """Set up test data."""
-        # Create users with unique usernames
-        unique_id = str(uuid.uuid4())[:8]
-        self.dean = User.objects.create_user(
-            username=f'dean_cgrade_{unique_id}',
-            email=f'dean_cgrade_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.ADMIN,
-            first_name='Dean',
-            last_name='Test'
-        )
-        
-        self.teacher_user = User.objects.create_user(
-            username=f'teacher_cgrade_{unique_id}',
-            email=f'teacher_cgrade_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.TEACHER,
-            first_name='Teacher',
-            last_name='Test'
-        )
+class GradeValidationTests(SimpleTestCase):
+    """
+    Business rules of GradeCreateSerializer.validate() checked on in-memory
+    instances, without touching the database.
+    """
+
+    @settings(max_examples=3, phases=[Phase.generate], deadline=None)
+    @given(
+        score=st.decimals(min_value=20.01, max_value=30, places=2),
+    )
+    def test_property_2_validation_enforcement_score_exceeds_max(self, score):
+        """
+        Feature: backend-api-implementation, Property 2: Validation Enforcement
         
-        # Create faculty and department
-        self.faculty = Faculty.objects.create(
-            name='Test Faculty',
-            code=f'TF{unique_id}',
-            dean=self.dean
-        )
-        self.department = Department.objects.create(
-            name='Test Department',
-            code=f'TD{unique_id}',
-            faculty=self.faculty,
-            head=self.dean
-        )
+        **Validates: Requirements 1.9**
         
-        # Create level and program
-        self.level, _ = Level.objects.get_or_create(name='L1', defaults={'order': 1})
-        self.program = Program.objects.create(
-            name='Test Program',
-            code=f'TP{unique_id}',
-            department=self.department,
-            level=self.level,
-            duration_years=3
-        )
+        For any invalid input data that violates model constraints or business rules,
+        the serializer should reject it and return detailed validation errors.
         
-        # Create academic year and semester
-        self.academic_year = AcademicYear.objects.create(
-            name=f'2023-2024-{unique_id}',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        self.semester = Semester.objects.create(
-            academic_year=self.academic_year,
-            semester_type='FALL',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=False
-        )
+        Test case: Score cannot exceed exam's max_score.
+        """
+        attrs = {
+            'exam': Exam(max_score=Decimal('20.00')),
+            'score': score,
+        }
+
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            GradeCreateSerializer().validate(attrs)
+
+        # Should have score error
+        self.assertIn('score', ctx.exception.detail)
+
+
+class CourseGradeSerializerPropertyTests(_AcademicsFixture, TestCase):
+    """Property tests for CourseGrade serializers."""
+
+    user_prefix = 'cgrade'
+    extra_users = ('teacher_user', 'student_user')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        super().setUpTestData()
+        unique_id = cls.unique_id
         
         # Create course
-        self.course = Course.objects.create(
+        cls.course = Course.objects.create(
             name='Test Course',
             code=f'TC{unique_id}',
-            program=self.program,
+            program=cls.program,
             credits=3
         )
         
         # Create student
-        self.student_user = User.objects.create_user(
-            username=f'student_cgrade_{unique_id}',
-            email=f'student_cgrade_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.STUDENT,
-            first_name='Student',
-            last_name='Test'
-        )
-        self.student = Student.objects.create(
-            user=self.student_user,
+        cls.student = Student.objects.create(
+            user=cls.student_user,
             student_id=f'STU{unique_id}',
-            program=self.program,
-            current_level=self.level,
+            program=cls.program,
+            current_level=cls.level,
             enrollment_date=date.today()
         )
 
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        final_score=st.decimals(min_value=0, max_value=20, places=2),
+        final_score=_SCORE_VALID,
         is_validated=st.booleans(),
     )
     def test_property_1_foreign_key_representation(self, final_score, is_validated):
@@ -826,35 +768,28 @@ class CourseGradeSerializerPropertyTests(TestCase):
         )
         
         # Test list serializer
-        list_serializer = CourseGradeListSerializer(course_grade)
+        list_serializer = CourseGradeListSerializer(load_for_serializer(CourseGradeListSerializer, course_grade))
         list_data = list_serializer.data
         
         # Verify readable representations are included
-        self.assertIn('student_name', list_data)
-        self.assertIn('student_matricule', list_data)
-        self.assertIn('course_name', list_data)
-        self.assertIn('course_code', list_data)
-        self.assertIn('semester_name', list_data)
+        self.assertLessEqual(_COURSE_GRADE_LIST_FIELDS, list_data.keys())
         
         # Verify values are correct
-        self.assertEqual(list_data['student_name'], self.student.user.get_full_name())
+        self.assertEqual(list_data['student_name'], self.student_full_name)
         self.assertEqual(list_data['student_matricule'], self.student.student_id)
         self.assertEqual(list_data['course_name'], self.course.name)
         self.assertEqual(list_data['course_code'], self.course.code)
         
         # Test detail serializer
-        detail_serializer = CourseGradeDetailSerializer(course_grade)
+        detail_serializer = CourseGradeDetailSerializer(load_for_serializer(CourseGradeDetailSerializer, course_grade))
         detail_data = detail_serializer.data
         
         # Verify additional readable representations in detail view
-        self.assertIn('student_program', detail_data)
-        self.assertIn('course_credits', detail_data)
-        self.assertIn('course_coefficient', detail_data)
-        self.assertIn('academic_year', detail_data)
+        self.assertLessEqual(_COURSE_GRADE_DETAIL_FIELDS, detail_data.keys())
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=3, phases=[Phase.generate])
     @given(
-        final_score=st.decimals(min_value=0, max_value=20, places=2),
+        final_score=_SCORE_VALID,
     )
     def test_property_2_validation_enforcement_duplicate_course_grade(self, final_score):
         """
@@ -884,17 +819,18 @@ class CourseGradeSerializerPropertyTests(TestCase):
         }
         
         serializer = CourseGradeCreateSerializer(data=data)
+        self.assertTrue(serializer.is_valid())
         
-        # Should be invalid due to duplicate course grade
-        is_valid = serializer.is_valid()
-        self.assertFalse(is_valid)
+        # Should be rejected on save by the unique constraint
+        with self.assertRaises(serializers.ValidationError) as context:
+            serializer.save()
         
         # Should have student error
-        self.assertIn('student', serializer.errors)
+        self.assertIn('student', context.exception.detail)
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=5)
     @given(
-        final_score=st.decimals(min_value=0, max_value=20, places=2),
+        final_score=_SCORE_AROUND_CUTOFFS,
     )
     def test_property_3_computed_properties_inclusion(self, final_score):
         """
@@ -914,100 +850,41 @@ class CourseGradeSerializerPropertyTests(TestCase):
         )
         
         # Serialize with detail serializer
-        serializer = CourseGradeDetailSerializer(course_grade)
+        serializer = CourseGradeDetailSerializer(load_for_serializer(CourseGradeDetailSerializer, course_grade))
         data = serializer.data
         
         # Verify grade_letter is included (automatically calculated on save)
         self.assertIn('grade_letter', data)
         
         # Verify grade_letter is correct based on final_score
-        if final_score >= 16:
-            self.assertEqual(data['grade_letter'], 'A')
-        elif final_score >= 14:
-            self.assertEqual(data['grade_letter'], 'B')
-        elif final_score >= 12:
-            self.assertEqual(data['grade_letter'], 'C')
-        elif final_score >= 10:
-            self.assertEqual(data['grade_letter'], 'D')
-        else:
-            self.assertEqual(data['grade_letter'], 'F')
+        self.assertEqual(data['grade_letter'], grade_letter_for(final_score))
 
 
 
-class ReportCardSerializerPropertyTests(TestCase):
+class ReportCardSerializerPropertyTests(_AcademicsFixture, TestCase):
     """Property tests for ReportCard serializers."""
+
+    user_prefix = 'report'
+    extra_users = ('student_user',)
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        # Create users with unique usernames
-        unique_id = str(uuid.uuid4())[:8]
-        self.dean = User.objects.create_user(
-            username=f'dean_report_{unique_id}',
-            email=f'dean_report_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.ADMIN,
-            first_name='Dean',
-            last_name='Test'
-        )
-        
-        # Create faculty and department
-        self.faculty = Faculty.objects.create(
-            name='Test Faculty',
-            code=f'TF{unique_id}',
-            dean=self.dean
-        )
-        self.department = Department.objects.create(
-            name='Test Department',
-            code=f'TD{unique_id}',
-            faculty=self.faculty,
-            head=self.dean
-        )
-        
-        # Create level and program
-        self.level, _ = Level.objects.get_or_create(name='L1', defaults={'order': 1})
-        self.program = Program.objects.create(
-            name='Test Program',
-            code=f'TP{unique_id}',
-            department=self.department,
-            level=self.level,
-            duration_years=3
-        )
-        
-        # Create academic year and semester
-        self.academic_year = AcademicYear.objects.create(
-            name=f'2023-2024-{unique_id}',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        self.semester = Semester.objects.create(
-            academic_year=self.academic_year,
-            semester_type='FALL',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=False
-        )
+        super().setUpTestData()
+        unique_id = cls.unique_id
         
         # Create student
-        self.student_user = User.objects.create_user(
-            username=f'student_report_{unique_id}',
-            email=f'student_report_{unique_id}@test.com',
-            password='testpass123',
-            role=User.Role.STUDENT,
-            first_name='Student',
-            last_name='Test'
-        )
-        self.student = Student.objects.create(
-            user=self.student_user,
+        cls.student = Student.objects.create(
+            user=cls.student_user,
             student_id=f'STU{unique_id}',
-            program=self.program,
-            current_level=self.level,
+            program=cls.program,
+            current_level=cls.level,
             enrollment_date=date.today()
         )
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        gpa=st.decimals(min_value=0, max_value=20, places=2),
+        gpa=_SCORE_VALID,
         total_credits=st.integers(min_value=0, max_value=60),
         credits_earned=st.integers(min_value=0, max_value=60),
         is_published=st.booleans(),
@@ -1037,37 +914,28 @@ class ReportCardSerializerPropertyTests(TestCase):
         )
         
         # Test list serializer
-        list_serializer = ReportCardListSerializer(report_card)
+        list_serializer = ReportCardListSerializer(load_for_serializer(ReportCardListSerializer, report_card))
         list_data = list_serializer.data
         
         # Verify readable representations are included
-        self.assertIn('student_name', list_data)
-        self.assertIn('student_matricule', list_data)
-        self.assertIn('program_name', list_data)
-        self.assertIn('semester_name', list_data)
-        self.assertIn('academic_year', list_data)
-        self.assertIn('generated_by_name', list_data)
+        self.assertLessEqual(_REPORT_CARD_LIST_FIELDS, list_data.keys())
         
         # Verify values are correct
-        self.assertEqual(list_data['student_name'], self.student.user.get_full_name())
+        self.assertEqual(list_data['student_name'], self.student_full_name)
         self.assertEqual(list_data['student_matricule'], self.student.student_id)
         self.assertEqual(list_data['program_name'], self.program.name)
-        self.assertEqual(list_data['generated_by_name'], self.dean.get_full_name())
+        self.assertEqual(list_data['generated_by_name'], self.dean_full_name)
         
         # Test detail serializer
-        detail_serializer = ReportCardDetailSerializer(report_card)
+        detail_serializer = ReportCardDetailSerializer(load_for_serializer(ReportCardDetailSerializer, report_card))
         detail_data = detail_serializer.data
         
         # Verify additional readable representations in detail view
-        self.assertIn('student_email', detail_data)
-        self.assertIn('student_program', detail_data)
-        self.assertIn('program_code', detail_data)
-        self.assertIn('student_level', detail_data)
-        self.assertIn('course_grades_count', detail_data)
+        self.assertLessEqual(_REPORT_CARD_DETAIL_FIELDS, detail_data.keys())
     
-    @settings(max_examples=10)
+    @settings(_DB_EXAMPLES, max_examples=10)
     @given(
-        gpa=st.decimals(min_value=0, max_value=20, places=2),
+        gpa=_SCORE_VALID,
     )
     def test_property_3_computed_properties_inclusion(self, gpa):
         """
@@ -1089,7 +957,7 @@ class ReportCardSerializerPropertyTests(TestCase):
         )
         
         # Serialize with detail serializer
-        serializer = ReportCardDetailSerializer(report_card)
+        serializer = ReportCardDetailSerializer(load_for_serializer(ReportCardDetailSerializer, report_card))
         data = serializer.data
         
         # Verify computed properties are included
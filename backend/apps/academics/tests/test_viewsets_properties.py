@@ -5,6 +5,8 @@ These tests verify universal properties that should hold for all valid inputs.
 Tests cover CRUD operations, pagination, filtering, searching, and ordering.
 """
 
+import itertools
+
 from hypothesis import given, strategies as st, settings
 from hypothesis.extra.django import TestCase
 from django.contrib.auth import get_user_model
@@ -21,75 +23,98 @@ from apps.teachers.models import Teacher, TeacherCourse
 
 User = get_user_model()
 
+# Suffixes keeping usernames and codes unique; parallel workers each have
+# their own database clone, so a per-process counter is enough
+_UNIQUE_IDS = itertools.count()
 
-class CoursePaginationPropertyTests(TestCase):
-    """Property tests for Course pagination consistency."""
-    
-    @settings(max_examples=10, deadline=None)
-    @given(
-        num_items=st.integers(min_value=21, max_value=100)
-    )
-    def test_property_4_pagination_consistency(self, num_items):
-        """
-        Feature: backend-api-implementation, Property 4: Pagination Consistency
-        
-        **Validates: Requirements 2.2**
-        
-        For any list endpoint with more than 20 items, the response should return
-        exactly 20 items per page with pagination metadata.
-        """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_pag_{num_items}',
-            email=f'admin_pag_{num_items}@test.com',
+
+class _CourseFixture:
+    """
+    Admin user and program, with its faculty, department, level, academic
+    year and semester, shared by the course endpoint property tests: created
+    once per class, while each example creates its own courses.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        super().setUpTestData()
+        cls.admin = User.objects.create_user(
+            username='admin_courses',
+            email='admin_courses@test.com',
             password='testpass123',
             role='ADMIN'
         )
         
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
+        cls.faculty = Faculty.objects.create(name='Test Faculty', code='TF')
+        cls.department = Department.objects.create(
             name='Test Department',
             code='TD',
-            faculty=faculty
+            faculty=cls.faculty
         )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
+        cls.level = Level.objects.create(name='L1', order=1)
+        cls.program = Program.objects.create(
             name='Test Program',
             code='TP',
-            department=department,
-            level=level
+            department=cls.department
         )
-        academic_year = AcademicYear.objects.create(
+        cls.program.levels.add(cls.level)
+        cls.academic_year = AcademicYear.objects.create(
             name='2023-2024',
             start_date=date(2023, 9, 1),
             end_date=date(2024, 6, 30),
             is_current=True
         )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
+        cls.semester = Semester.objects.create(
+            academic_year=cls.academic_year,
             semester_type='S1',
             start_date=date(2023, 9, 1),
             end_date=date(2024, 1, 31),
             is_current=True
         )
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up an API client authenticated as the admin."""
+        super().setUpClass()
+        # force_authenticate sets no session cookie: the client holds no
+        # per-example state and is shared by the whole class
+        cls.admin_client = APIClient()
+        cls.admin_client.force_authenticate(user=cls.admin)
+
+
+class CoursePaginationPropertyTests(_CourseFixture, TestCase):
+    """Property tests for Course pagination consistency."""
+    
+    @settings(max_examples=10, deadline=None)
+    @given(
+        num_items=st.integers(min_value=21, max_value=100)
+    )
+    def test_property_4_pagination_consistency(self, num_items):
+        """
+        Feature: backend-api-implementation, Property 4: Pagination Consistency
+        
+        **Validates: Requirements 2.2**
         
+        For any list endpoint with more than 20 items, the response should return
+        exactly 20 items per page with pagination metadata.
+        """
         # Create multiple courses
-        for i in range(num_items):
-            Course.objects.create(
+        Course.objects.bulk_create([
+            Course(
                 name=f'Course {num_items}_{i}',
                 code=f'C{num_items}{i:04d}',
-                program=program,
+                program=self.program,
                 course_type='REQUIRED',
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=True
             )
+            for i in range(num_items)
+        ])
         
         # Make API request
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get('/api/academics/courses/')
+        response = self.admin_client.get('/api/academics/courses/')
         
         # Verify pagination
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -103,7 +128,7 @@ class CoursePaginationPropertyTests(TestCase):
         self.assertEqual(response.data['count'], num_items)
 
 
-class CourseDetailEndpointPropertyTests(TestCase):
+class CourseDetailEndpointPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course detail endpoint completeness."""
     
     @settings(max_examples=10, deadline=None)
@@ -120,57 +145,19 @@ class CourseDetailEndpointPropertyTests(TestCase):
         For any detail endpoint request, the response should include all fields
         defined in the detail serializer for that resource.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_det_{year}',
-            email=f'admin_det_{year}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name=f'{year}-{year+1}',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 1, 31),
-            is_current=True
-        )
-        
         # Create course
         course = Course.objects.create(
             name='Test Course',
             code=f'TC{year}',
-            program=program,
+            program=self.program,
             course_type='REQUIRED',
             credits=credits,
-            semester=semester,
+            level=self.level,
             is_active=True
         )
         
         # Make API request
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get(f'/api/academics/courses/{course.id}/')
+        response = self.admin_client.get(f'/api/academics/courses/{course.id}/')
         
         # Verify response
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -178,16 +165,16 @@ class CourseDetailEndpointPropertyTests(TestCase):
         # Verify all expected fields are present
         expected_fields = [
             'id', 'name', 'code', 'description', 'program', 'course_type',
-            'credits', 'semester', 'is_active', 'created_at', 'updated_at',
+            'credits', 'semester_type', 'level', 'is_active', 'created_at', 'updated_at',
             # Computed/display fields
-            'program_name', 'program_code', 'semester_name', 'course_type_display',
+            'program_name', 'program_code', 'semester_type_display', 'course_type_display',
             'prerequisites_count', 'exams_count'
         ]
         for field in expected_fields:
             self.assertIn(field, response.data, f"Field '{field}' missing from detail response")
 
 
-class CourseCreateOperationPropertyTests(TestCase):
+class CourseCreateOperationPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course create operations."""
     
     @settings(max_examples=10, deadline=None)
@@ -204,57 +191,19 @@ class CourseCreateOperationPropertyTests(TestCase):
         For any valid create request, the API should return HTTP 201 with the
         created resource containing all fields including auto-generated ones.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_create_{year}',
-            email=f'admin_create_{year}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name=f'{year}-{year+1}',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 1, 31),
-            is_current=True
-        )
-        
         # Prepare data
         data = {
             'name': f'New Course {year}',
             'code': f'NC{year}',
-            'program': program.id,
+            'program': self.program.id,
             'course_type': 'REQUIRED',
             'credits': credits,
-            'semester': semester.id,
+            'level': self.level.id,
             'is_active': True
         }
         
         # Make API request
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.post('/api/academics/courses/', data)
+        response = self.admin_client.post('/api/academics/courses/', data)
         
         # Verify response
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -262,7 +211,7 @@ class CourseCreateOperationPropertyTests(TestCase):
         self.assertEqual(response.data['credits'], data['credits'])
 
 
-class CourseUpdateOperationPropertyTests(TestCase):
+class CourseUpdateOperationPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course update operations."""
     
     @settings(max_examples=10, deadline=None)
@@ -279,50 +228,14 @@ class CourseUpdateOperationPropertyTests(TestCase):
         For any valid update request, the API should return HTTP 200 with the
         updated resource reflecting all changes.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_upd_{old_credits}_{new_credits}',
-            email=f'admin_upd_{old_credits}_{new_credits}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name='2023-2024',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=True
-        )
-        
         # Create course
         course = Course.objects.create(
             name='Test Course',
             code=f'TC{old_credits}{new_credits}',
-            program=program,
+            program=self.program,
             course_type='REQUIRED',
             credits=old_credits,
-            semester=semester,
+            level=self.level,
             is_active=True
         )
         
@@ -332,9 +245,7 @@ class CourseUpdateOperationPropertyTests(TestCase):
         }
         
         # Make API request
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.patch(f'/api/academics/courses/{course.id}/', data)
+        response = self.admin_client.patch(f'/api/academics/courses/{course.id}/', data)
         
         # Verify response
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -345,7 +256,7 @@ class CourseUpdateOperationPropertyTests(TestCase):
         self.assertEqual(course.credits, new_credits)
 
 
-class CourseDeleteOperationPropertyTests(TestCase):
+class CourseDeleteOperationPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course delete operations."""
     
     @settings(max_examples=10, deadline=None)
@@ -361,67 +272,29 @@ class CourseDeleteOperationPropertyTests(TestCase):
         For any valid delete request, the API should return HTTP 204 with no content,
         and subsequent GET requests should return HTTP 404.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_del_{year}',
-            email=f'admin_del_{year}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name=f'{year}-{year+1}',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 1, 31),
-            is_current=True
-        )
-        
         # Create course
         course = Course.objects.create(
             name='Delete Course',
             code=f'DEL{year}',
-            program=program,
+            program=self.program,
             course_type='REQUIRED',
             credits=3,
-            semester=semester,
+            level=self.level,
             is_active=True
         )
         
         # Make delete request
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.delete(f'/api/academics/courses/{course.id}/')
+        response = self.admin_client.delete(f'/api/academics/courses/{course.id}/')
         
         # Verify delete response
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         
         # Verify subsequent GET returns 404
-        response = client.get(f'/api/academics/courses/{course.id}/')
+        response = self.admin_client.get(f'/api/academics/courses/{course.id}/')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
-class CourseValidationErrorPropertyTests(TestCase):
+class CourseValidationErrorPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course validation error responses."""
     
     @settings(max_examples=10, deadline=None)
@@ -437,64 +310,27 @@ class CourseValidationErrorPropertyTests(TestCase):
         For any request with invalid data, the API should return HTTP 400 with
         a JSON object containing field-level error messages.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_val_{year}',
-            email=f'admin_val_{year}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name=f'{year}-{year+1}',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(year, 9, 1),
-            end_date=date(year+1, 1, 31),
-            is_current=True
-        )
-        
         # Prepare invalid data (missing required field)
         data = {
             'name': 'Invalid Course',
             # Missing code (required field)
-            'program': program.id,
+            'program': self.program.id,
             'course_type': 'REQUIRED',
             'credits': 3,
-            'semester': semester.id
+            'level': self.level.id
         }
         
         # Make API request
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.post('/api/academics/courses/', data)
+        response = self.admin_client.post('/api/academics/courses/', data)
         
         # Verify validation error
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertTrue(isinstance(response.data, dict))
-        self.assertIn('code', response.data)
+        # Field errors are under error.details (apps.core.exceptions)
+        self.assertIn('code', response.data['error']['details'])
 
 
-class CourseNotFoundPropertyTests(TestCase):
+class CourseNotFoundPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course not found responses."""
     
     @settings(max_examples=10, deadline=None)
@@ -510,24 +346,14 @@ class CourseNotFoundPropertyTests(TestCase):
         For any request for a non-existent resource, the API should return
         HTTP 404 with an appropriate error message.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_404_{non_existent_id}',
-            email=f'admin_404_{non_existent_id}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
         # Make API request for non-existent resource
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get(f'/api/academics/courses/{non_existent_id}/')
+        response = self.admin_client.get(f'/api/academics/courses/{non_existent_id}/')
         
         # Verify not found response
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
-class CourseFilterPropertyTests(TestCase):
+class CourseFilterPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course filtering accuracy."""
     
     @settings(max_examples=10, deadline=None)
@@ -545,73 +371,35 @@ class CourseFilterPropertyTests(TestCase):
         results should match the filter criteria exactly.
         """
         # Create unique identifier for this test run
-        import uuid
-        test_id = str(uuid.uuid4())[:8]
+        test_id = f'{next(_UNIQUE_IDS):08x}'
         
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_filt_{test_id}',
-            email=f'admin_filt_{test_id}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name=f'Faculty-{test_id}', code=f'F{test_id}')
-        department = Department.objects.create(
-            name=f'Department-{test_id}',
-            code=f'D{test_id}',
-            faculty=faculty
-        )
-        level = Level.objects.create(name=f'L1-{test_id}', order=1)
-        program = Program.objects.create(
-            name=f'Program-{test_id}',
-            code=f'P{test_id}',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name=f'AY-{test_id}',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=False
-        )
-        
-        # Create required courses
-        for i in range(num_required):
-            Course.objects.create(
+        # Create required and elective courses
+        Course.objects.bulk_create([
+            Course(
                 name=f'Required-{test_id}-{i}',
                 code=f'REQ{test_id}{i}',
-                program=program,
+                program=self.program,
                 course_type='REQUIRED',
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=True
             )
-        
-        # Create elective courses
-        for i in range(num_elective):
-            Course.objects.create(
+            for i in range(num_required)
+        ] + [
+            Course(
                 name=f'Elective-{test_id}-{i}',
                 code=f'ELEC{test_id}{i}',
-                program=program,
+                program=self.program,
                 course_type='ELECTIVE',
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=True
             )
+            for i in range(num_elective)
+        ])
         
         # Make API request with filter for required courses
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get('/api/academics/courses/?course_type=REQUIRED')
+        response = self.admin_client.get('/api/academics/courses/?course_type=REQUIRED')
         
         # Verify filter accuracy
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -627,7 +415,7 @@ class CourseFilterPropertyTests(TestCase):
             self.assertEqual(result['course_type'], 'REQUIRED')
 
 
-class CourseSearchPropertyTests(TestCase):
+class CourseSearchPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course search result relevance."""
     
     @settings(max_examples=10, deadline=None)
@@ -645,70 +433,33 @@ class CourseSearchPropertyTests(TestCase):
         For any search query provided, all returned results should contain the
         search term in at least one of the searchable fields.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_search_{len(search_term)}',
-            email=f'admin_search_{len(search_term)}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name='2023-2024',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=True
-        )
-        
-        # Create matching courses (search term in code)
-        for i in range(num_matching):
-            Course.objects.create(
+        # Create matching courses (search term in code) and non-matching ones
+        Course.objects.bulk_create([
+            Course(
                 name=f'Course {i}',
                 code=f'{search_term}{i}',
-                program=program,
+                program=self.program,
                 course_type='REQUIRED',
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=True
             )
-        
-        # Create non-matching courses
-        for i in range(num_non_matching):
-            Course.objects.create(
+            for i in range(num_matching)
+        ] + [
+            Course(
                 name=f'Different Course {i}',
                 code=f'DIFF{i}',
-                program=program,
+                program=self.program,
                 course_type='REQUIRED',
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=True
             )
+            for i in range(num_non_matching)
+        ])
         
         # Make API request with search
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get(f'/api/academics/courses/?search={search_term}')
+        response = self.admin_client.get(f'/api/academics/courses/?search={search_term}')
         
         # Verify search relevance
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -719,7 +470,7 @@ class CourseSearchPropertyTests(TestCase):
             self.assertIn(search_term.lower(), result['code'].lower())
 
 
-class CourseOrderingPropertyTests(TestCase):
+class CourseOrderingPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course ordering correctness."""
     
     @settings(max_examples=10, deadline=None)
@@ -735,61 +486,22 @@ class CourseOrderingPropertyTests(TestCase):
         For any ordering parameter provided, the returned results should be
         sorted in the specified order by the specified field.
         """
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_order_{num_items}',
-            email=f'admin_order_{num_items}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name='Test Faculty', code='TF')
-        department = Department.objects.create(
-            name='Test Department',
-            code='TD',
-            faculty=faculty
-        )
-        level = Level.objects.create(name='L1', order=1)
-        program = Program.objects.create(
-            name='Test Program',
-            code='TP',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name='2023-2024',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=True
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=True
-        )
-        
         # Create courses with different codes
-        codes = []
-        for i in range(num_items):
-            code = f'COURSE{1000 + (i * 100)}'
-            codes.append(code)
-            Course.objects.create(
+        Course.objects.bulk_create([
+            Course(
                 name=f'Course {i}',
-                code=code,
-                program=program,
+                code=f'COURSE{1000 + (i * 100)}',
+                program=self.program,
                 course_type='REQUIRED',
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=True
             )
+            for i in range(num_items)
+        ])
         
         # Make API request with ascending order
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get('/api/academics/courses/?ordering=code')
+        response = self.admin_client.get('/api/academics/courses/?ordering=code')
         
         # Verify ordering
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -797,13 +509,13 @@ class CourseOrderingPropertyTests(TestCase):
         self.assertEqual(result_codes, sorted(result_codes))
         
         # Make API request with descending order
-        response = client.get('/api/academics/courses/?ordering=-code')
+        response = self.admin_client.get('/api/academics/courses/?ordering=-code')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         result_codes = [r['code'] for r in response.data['results']]
         self.assertEqual(result_codes, sorted(result_codes, reverse=True))
 
 
-class CourseMultipleFilterPropertyTests(TestCase):
+class CourseMultipleFilterPropertyTests(_CourseFixture, TestCase):
     """Property tests for Course multiple filter combination."""
     
     @settings(max_examples=10, deadline=None)
@@ -824,74 +536,37 @@ class CourseMultipleFilterPropertyTests(TestCase):
         should satisfy all filter conditions simultaneously.
         """
         # Create unique identifier for this test run
-        import uuid
-        test_id = str(uuid.uuid4())[:8]
-        
-        # Create admin user
-        admin = User.objects.create_user(
-            username=f'admin_multi_{test_id}',
-            email=f'admin_multi_{test_id}@test.com',
-            password='testpass123',
-            role='ADMIN'
-        )
-        
-        # Create necessary related objects
-        faculty = Faculty.objects.create(name=f'Faculty-{test_id}', code=f'F{test_id}')
-        department = Department.objects.create(
-            name=f'Department-{test_id}',
-            code=f'D{test_id}',
-            faculty=faculty
-        )
-        level = Level.objects.create(name=f'L1-{test_id}', order=1)
-        program = Program.objects.create(
-            name=f'Program-{test_id}',
-            code=f'P{test_id}',
-            department=department,
-            level=level
-        )
-        academic_year = AcademicYear.objects.create(
-            name=f'AY-{test_id}',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 6, 30),
-            is_current=False
-        )
-        semester = Semester.objects.create(
-            academic_year=academic_year,
-            semester_type='S1',
-            start_date=date(2023, 9, 1),
-            end_date=date(2024, 1, 31),
-            is_current=False
-        )
+        test_id = f'{next(_UNIQUE_IDS):08x}'
         
-        # Create matching courses (specific course_type and is_active)
-        for i in range(num_matching):
-            Course.objects.create(
+        # Create matching courses (specific course_type and is_active) and
+        # non-matching ones (different course_type or is_active)
+        different_type = 'PRACTICAL' if course_type == 'REQUIRED' else 'REQUIRED'
+        Course.objects.bulk_create([
+            Course(
                 name=f'Match-{test_id}-{i}',
                 code=f'MATCH{test_id}{i}',
-                program=program,
+                program=self.program,
                 course_type=course_type,
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=is_active
             )
-        
-        # Create non-matching courses (different course_type or is_active)
-        for i in range(num_non_matching):
-            different_type = 'PRACTICAL' if course_type == 'REQUIRED' else 'REQUIRED'
-            Course.objects.create(
+            for i in range(num_matching)
+        ] + [
+            Course(
                 name=f'NoMatch-{test_id}-{i}',
                 code=f'NOMATCH{test_id}{i}',
-                program=program,
+                program=self.program,
                 course_type=different_type if i % 2 == 0 else course_type,
                 credits=3,
-                semester=semester,
+                level=self.level,
                 is_active=not is_active if i % 2 == 1 else is_active
             )
+            for i in range(num_non_matching)
+        ])
         
         # Make API request with multiple filters
-        client = APIClient()
-        client.force_authenticate(user=admin)
-        response = client.get(
+        response = self.admin_client.get(
             f'/api/academics/courses/?course_type={course_type}&is_active={str(is_active).lower()}'
         )
         
@@ -15,9 +15,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from apps.core.permissions import IsAdminOrReadOnly, IsTeacherOrAdmin, IsSecretaryOrAdmin
-from .models import Course, Exam, Grade, CourseGrade, ReportCard
-from django.db import transaction
-from django.db.models import Sum, Avg, Max, Min, Q
+from apps.core.prefetch import SerializerPrefetchMixin
+from .models import (
+    Course, Exam, Grade, CourseGrade, ReportCard, GPA_QUANTUM, ZERO
+)
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Avg, Max, Min, Q, Count, Prefetch
 from django.http import HttpResponse
 from .utils import export_grades_template, export_current_grades
 import openpyxl
@@ -30,7 +33,7 @@ from .serializers import (
 )
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(SerializerPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing courses.
     
@@ -62,10 +65,8 @@ class CourseViewSet(viewsets.ModelViewSet):
     - code, name, credits, created_at
     """
     
-    queryset = Course.objects.select_related(
-        'program', 'program__department', 'program__department__faculty',
-        'level'
-    ).prefetch_related('prerequisites', 'exams').all()
+    # Related objects are loaded per action from the serializer's Meta
+    queryset = Course.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['program', 'semester_type', 'course_type', 'is_active', 'level']
@@ -259,7 +260,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         })
 
 
-class ExamViewSet(viewsets.ModelViewSet):
+class ExamViewSet(SerializerPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing exams.
     
@@ -288,9 +289,8 @@ class ExamViewSet(viewsets.ModelViewSet):
     - date, start_time, created_at
     """
     
-    queryset = Exam.objects.select_related(
-        'course', 'course__program', 'semester', 'semester__academic_year', 'classroom'
-    ).prefetch_related('grades').all()
+    # Related objects are loaded per action from the serializer's Meta
+    queryset = Exam.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['course', 'semester', 'exam_type', 'classroom', 'date']
@@ -347,7 +347,7 @@ class ExamViewSet(viewsets.ModelViewSet):
         return self.queryset
 
 
-class GradeViewSet(viewsets.ModelViewSet):
+class GradeViewSet(SerializerPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing grades.
     
@@ -380,11 +380,8 @@ class GradeViewSet(viewsets.ModelViewSet):
     - Teachers can only create/update grades for courses they teach
     """
     
-    queryset = Grade.objects.select_related(
-        'student', 'student__user', 'student__program',
-        'exam', 'exam__course', 'exam__semester',
-        'graded_by'
-    ).all()
+    # Related objects are loaded per action from the serializer's Meta
+    queryset = Grade.objects.with_percentage()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['student', 'exam', 'is_absent', 'exam__semester']
@@ -513,8 +510,10 @@ class GradeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        created = []
+        from .signals import recalculate_course_grades
+
         errors = []
+        valid = []
         
         for grade_data in grades_data:
             serializer = GradeCreateSerializer(data=grade_data)
@@ -538,13 +537,70 @@ class GradeViewSet(viewsets.ModelViewSet):
                             })
                             continue
                 
-                serializer.save(graded_by=request.user)
-                created.append(serializer.data)
+                valid.append((grade_data, serializer))
             else:
                 errors.append({
                     "data": grade_data,
                     "errors": serializer.errors
                 })
+
+        # Existing grades for the whole batch in one query, instead of one per row
+        existing = set(Grade.objects.filter(
+            student_id__in={serializer.validated_data['student'].id for _, serializer in valid},
+            exam_id__in={serializer.validated_data['exam'].id for _, serializer in valid}
+        ).values_list('student_id', 'exam_id'))
+
+        pending = []
+        for grade_data, serializer in valid:
+            student = serializer.validated_data['student']
+            exam = serializer.validated_data['exam']
+            if (student.id, exam.id) in existing:
+                errors.append({
+                    "data": grade_data,
+                    "errors": {"student": [GradeCreateSerializer.duplicate_error['student']]}
+                })
+                continue
+            existing.add((student.id, exam.id))
+
+            grade = Grade(**{**serializer.validated_data, 'graded_by': request.user})
+            grade.set_normalized_score()
+            pending.append((grade_data, serializer, grade))
+
+        with transaction.atomic():
+            while True:
+                try:
+                    with transaction.atomic():
+                        Grade.objects.bulk_create(
+                            [grade for _, _, grade in pending], batch_size=500
+                        )
+                    break
+                except IntegrityError:
+                    # Grades inserted concurrently since the check above:
+                    # report them as duplicates and insert the rest
+                    taken = set(Grade.objects.filter(
+                        student_id__in={grade.student_id for _, _, grade in pending},
+                        exam_id__in={grade.exam_id for _, _, grade in pending}
+                    ).values_list('student_id', 'exam_id'))
+                    remaining = []
+                    for grade_data, serializer, grade in pending:
+                        if (grade.student_id, grade.exam_id) in taken:
+                            errors.append({
+                                "data": grade_data,
+                                "errors": {"student": [GradeCreateSerializer.duplicate_error['student']]}
+                            })
+                        else:
+                            remaining.append((grade_data, serializer, grade))
+                    if len(remaining) == len(pending):
+                        raise
+                    pending = remaining
+
+            # bulk_create bypasses the Grade signals: refresh course grades here
+            recalculate_course_grades(
+                (grade.student_id, grade.exam.course_id, grade.exam.semester_id)
+                for _, _, grade in pending
+            )
+
+        created = [serializer.to_representation(grade) for _, serializer, grade in pending]
         
         return Response({
             'created': len(created),
@@ -590,7 +646,9 @@ class GradeViewSet(viewsets.ModelViewSet):
         except Exam.DoesNotExist:
             return Response({"error": "Examen non trouvé"}, status=status.HTTP_404_NOT_FOUND)
 
-        grades = Grade.objects.filter(exam_id=exam_id).select_related('student', 'student__user', 'graded_by')
+        grades = Grade.objects.filter(exam_id=exam_id).with_percentage().select_related(
+            'student', 'student__user', 'graded_by'
+        )
         serializer = GradeListSerializer(grades, many=True)
 
         buffer = export_current_grades(exam, serializer.data)
@@ -629,56 +687,68 @@ class GradeViewSet(viewsets.ModelViewSet):
             
             from apps.students.models import Student
             from decimal import Decimal, InvalidOperation
+            from .signals import defer_course_grade_recalculation
 
             results = {'created': 0, 'updated': 0, 'errors': []}
-            
-            with transaction.atomic():
-                # Skip header
-                for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-                    matricule, name, score_val, absent_val, remarks = row[0:5]
-                    
-                    if not matricule:
+
+            # Skip header
+            rows = [
+                (row_idx, row[0:5])
+                for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2)
+                if row[0]
+            ]
+
+            # One query for every student referenced in the file
+            students = Student.objects.in_bulk(
+                {str(values[0]) for _, values in rows}, field_name='student_id'
+            )
+            existing_ids = set(
+                Grade.objects.filter(exam=exam).values_list('student_id', flat=True)
+            )
+
+            records = {}
+            for row_idx, (matricule, name, score_val, absent_val, remarks) in rows:
+                try:
+                    student = students.get(str(matricule))
+                    if student is None:
+                        results['errors'].append(f"Ligne {row_idx}: Étudiant avec le matricule {matricule} non trouvé")
                         continue
-                        
-                    try:
-                        student = Student.objects.get(student_id=matricule)
-                        # Basic score validation
-                        is_absent = str(absent_val).strip().upper() in ['O', 'OUI', 'Y', 'YES', 'TRUE']
-                        
-                        score = Decimal('0.00')
-                        if not is_absent and score_val is not None:
-                            try:
-                                score = Decimal(str(score_val))
-                                if score > exam.max_score:
-                                    results['errors'].append(f"Ligne {row_idx}: La note {score} dépasse le maximum {exam.max_score}")
-                                    continue
-                                if score < 0:
-                                    results['errors'].append(f"Ligne {row_idx}: La note ne peut pas être négative")
-                                    continue
-                            except (InvalidOperation, ValueError):
-                                results['errors'].append(f"Ligne {row_idx}: Format de note invalide: {score_val}")
+
+                    # Basic score validation
+                    is_absent = str(absent_val).strip().upper() in ['O', 'OUI', 'Y', 'YES', 'TRUE']
+
+                    score = ZERO
+                    if not is_absent and score_val is not None:
+                        try:
+                            score = Decimal(str(score_val))
+                            if score > exam.max_score:
+                                results['errors'].append(f"Ligne {row_idx}: La note {score} dépasse le maximum {exam.max_score}")
                                 continue
-                        
-                        grade, created = Grade.objects.update_or_create(
-                            student=student,
-                            exam=exam,
-                            defaults={
-                                'score': score,
-                                'is_absent': is_absent,
-                                'remarks': str(remarks or ""),
-                                'graded_by': request.user
-                            }
-                        )
-                        
-                        if created:
-                            results['created'] += 1
-                        else:
-                            results['updated'] += 1
-                            
-                    except Student.DoesNotExist:
-                        results['errors'].append(f"Ligne {row_idx}: Étudiant avec le matricule {matricule} non trouvé")
-                    except Exception as e:
-                        results['errors'].append(f"Ligne {row_idx}: Erreur inattendue: {str(e)}")
+                            if score < 0:
+                                results['errors'].append(f"Ligne {row_idx}: La note ne peut pas être négative")
+                                continue
+                        except (InvalidOperation, ValueError):
+                            results['errors'].append(f"Ligne {row_idx}: Format de note invalide: {score_val}")
+                            continue
+
+                    if student.id in existing_ids or student.id in records:
+                        results['updated'] += 1
+                    else:
+                        results['created'] += 1
+                    # A repeated matricule overwrites the earlier row, as before
+                    records[student.id] = (student.id, score, is_absent, str(remarks or ""))
+
+                except Exception as e:
+                    results['errors'].append(f"Ligne {row_idx}: Erreur inattendue: {str(e)}")
+
+            # Course grades are recalculated once, when the block exits
+            with transaction.atomic(), defer_course_grade_recalculation() as course_grades:
+                Grade.objects.bulk_record(exam, records.values(), graded_by=request.user)
+
+                # bulk_record bypasses the Grade signals: add its buckets
+                course_grades.update(
+                    (student_id, exam.course_id, exam.semester_id) for student_id in records
+                )
 
             return Response(results)
         except Exception as e:
@@ -703,22 +773,20 @@ class GradeViewSet(viewsets.ModelViewSet):
             except Student.DoesNotExist:
                 return Response({"error": "Profil étudiant non trouvé"}, status=status.HTTP_404_NOT_FOUND)
 
-        grades = Grade.objects.filter(student_id=student_id).select_related(
+        grades = Grade.objects.filter(student_id=student_id).with_percentage().select_related(
             'exam', 'exam__course', 'exam__semester', 'exam__semester__academic_year'
         ).order_by('-exam__date')
 
         serializer = GradeListSerializer(grades, many=True)
         
-        # Calculate some stats
+        # Calculate some stats, all in one aggregate query
         stats = grades.aggregate(
             avg_score=Avg('score'),
             max_score=Max('score'),
             min_score=Min('score'),
-            total_exams=Sum(Q(score__isnull=False)), # This is a bit weird, aggregate doesn't work like this for count
+            total_exams=Count('id'),
+            absences=Count('id', filter=Q(is_absent=True)),
         )
-        # Fix total count
-        stats['total_exams'] = grades.count()
-        stats['absences'] = grades.filter(is_absent=True).count()
 
         return Response({
             'grades': serializer.data,
@@ -727,7 +795,7 @@ class GradeViewSet(viewsets.ModelViewSet):
 
 
 
-class CourseGradeViewSet(viewsets.ModelViewSet):
+class CourseGradeViewSet(SerializerPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing course grades.
     
@@ -759,12 +827,8 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
     - final_score, created_at, validated_at
     """
     
-    queryset = CourseGrade.objects.select_related(
-        'student', 'student__user', 'student__program',
-        'course', 'course__program',
-        'semester', 'semester__academic_year',
-        'validated_by'
-    ).all()
+    # Related objects are loaded per action from the serializer's Meta
+    queryset = CourseGrade.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['student', 'course', 'semester', 'is_validated', 'grade_letter']
@@ -829,7 +893,6 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
         Normalized Score = (Grade / Max Score) * 20
         Final Grade = Sum(Normalized Score * Exam Weight) / Sum(Exam Weights)
         """
-        from decimal import Decimal
         from apps.students.models import Enrollment
         from apps.academics.models import Exam, Grade
         
@@ -864,9 +927,11 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
         except Course.DoesNotExist:
             return Response({"error": "Cours non trouvé"}, status=status.HTTP_404_NOT_FOUND)
             
-        # Get exams for this course and semester
-        exams = Exam.objects.filter(course_id=course_id, semester_id=semester_id)
-        if not exams.exists():
+        # Get exams for this course and semester (only what the average reads)
+        exams = list(
+            Exam.objects.filter(course_id=course_id, semester_id=semester_id).only('weight')
+        )
+        if not exams:
              return Response(
                 {"error": "Aucun examen trouvé pour ce cours et ce semestre"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -880,7 +945,14 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
             program=course.program,
             academic_year__semesters__id=semester_id, # Link enrollment to semester's year
             status='ACTIVE'
-        ).select_related('student').distinct()
+        ).select_related('student').prefetch_related(
+            # Each student's grades for these exams, attached in one query
+            Prefetch(
+                'student__grades',
+                queryset=Grade.objects.filter(exam__in=exams).only('student', 'exam', 'normalized_score'),
+                to_attr='course_exam_grades'
+            )
+        ).distinct()
         
         updated_count = 0
         created_count = 0
@@ -889,33 +961,28 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
             student = enrollment.student
             
             # Get grades for this student and these exams
-            grades = Grade.objects.filter(student=student, exam__in=exams)
+            grades = student.course_exam_grades
             
-            if not grades.exists():
+            if not grades:
                 continue
                 
-            total_weighted_user_score = Decimal('0.00')
-            total_weight = Decimal('0.00')
+            total_weighted_user_score = ZERO
+            total_weight = ZERO
             
             for grade in grades:
                 exam = exam_map[grade.exam_id]
                 
-                # Normalize score to 20
-                if exam.max_score > 0:
-                    normalized_score = (grade.score / exam.max_score) * 20
-                else:
-                    normalized_score = Decimal('0.00')
-                    
-                total_weighted_user_score += normalized_score * exam.weight
+                # Score out of 20, stored when the grade was written
+                total_weighted_user_score += grade.normalized_score * exam.weight
                 total_weight += exam.weight
             
             if total_weight > 0:
                 final_score = total_weighted_user_score / total_weight
             else:
-                final_score = Decimal('0.00')
+                final_score = ZERO
                 
             # Round to 2 decimal places
-            final_score = final_score.quantize(Decimal('0.01'))
+            final_score = final_score.quantize(GPA_QUANTUM)
             
             # Create or update CourseGrade
             obj, created = CourseGrade.objects.update_or_create(
@@ -958,7 +1025,7 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
         course_grade.is_validated = True
         course_grade.validated_by = request.user
         course_grade.validated_at = timezone.now()
-        course_grade.save()
+        course_grade.save(update_fields=['is_validated', 'validated_by', 'validated_at', 'updated_at'])
         
         serializer = CourseGradeDetailSerializer(course_grade)
         return Response({
@@ -1035,7 +1102,7 @@ class CourseGradeViewSet(viewsets.ModelViewSet):
         })
 
 
-class ReportCardViewSet(viewsets.ModelViewSet):
+class ReportCardViewSet(SerializerPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing report cards.
     
@@ -1066,11 +1133,8 @@ class ReportCardViewSet(viewsets.ModelViewSet):
     - gpa, generated_at, published_at
     """
     
-    queryset = ReportCard.objects.select_related(
-        'student', 'student__user', 'student__program', 'student__current_level',
-        'semester', 'semester__academic_year',
-        'generated_by'
-    ).all()
+    # Related objects are loaded per action from the serializer's Meta
+    queryset = ReportCard.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['student', 'semester', 'is_published']
@@ -1138,6 +1202,9 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         """
         report_card = self.get_object()
         report_card.calculate_gpa()
+        if report_card.is_published:
+            report_card.courses_payload = ReportCardDetailSerializer.render_courses_payload(report_card)
+            report_card.save(update_fields=['courses_payload'])
         
         serializer = ReportCardDetailSerializer(report_card)
         return Response({
@@ -1165,7 +1232,8 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         
         report_card.is_published = True
         report_card.published_at = timezone.now()
-        report_card.save()
+        report_card.courses_payload = ReportCardDetailSerializer.render_courses_payload(report_card)
+        report_card.save(update_fields=['is_published', 'published_at', 'courses_payload'])
         
         serializer = ReportCardDetailSerializer(report_card)
         return Response({
@@ -1249,30 +1317,26 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         # Filter out students who already have report cards
         students = students.exclude(id__in=existing_report_cards)
         
-        created_count = 0
-        errors = []
-        
-        for student in students:
-            try:
-                report_card = ReportCard.objects.create(
-                    student=student,
+        with transaction.atomic():
+            report_cards = ReportCard.objects.bulk_create([
+                ReportCard(
+                    student_id=student_id,
                     semester=semester,
                     generated_by=request.user
                 )
-                # Calculate GPA
-                report_card.calculate_gpa()
-                created_count += 1
-            except Exception as e:
-                errors.append({
-                    "student_id": student.id,
-                    "error": str(e)
-                })
+                for student_id in students.values_list('id', flat=True)
+            ])
+            # Calculate GPA for the whole batch in a single UPDATE
+            ReportCard.recalculate_for_semester(
+                semester,
+                student_ids=[report_card.student_id for report_card in report_cards]
+            )
+        created_count = len(report_cards)
         
         return Response({
             "message": f"{created_count} bulletins générés avec succès",
             "created_count": created_count,
-            "semester_id": semester_id,
-            "errors": errors
+            "semester_id": semester_id
         })
 
 
@@ -1312,7 +1376,38 @@ class DeliberationViewSet(viewsets.ViewSet):
             except Student.DoesNotExist:
                 return Response({'error': 'Étudiant introuvable'}, status=status.HTTP_404_NOT_FOUND)
         elif program_id:
-            students_to_process = Student.objects.filter(program_id=program_id, status='ACTIVE')
+            # Whole program: deliberate the cohort in a constant number of queries
+            try:
+                promotions, failures = DeliberationService.deliberate_cohort(
+                    academic_year, program=program_id
+                )
+            except ValueError as e:
+                students = Student.objects.filter(
+                    program_id=program_id, status='ACTIVE'
+                ).select_related('user')
+                results = [
+                    {'student': student.user.get_full_name(), 'error': str(e)}
+                    for student in students
+                ]
+            else:
+                results = [
+                    {
+                        'student': promotion.student.user.get_full_name(),
+                        'matricule': promotion.student.student_id,
+                        'decision': promotion.get_decision_display(),
+                        'annual_gpa': promotion.annual_gpa
+                    }
+                    for promotion in promotions
+                ]
+                # Students left out of the cohort are reported one by one
+                results += [
+                    {'student': student.user.get_full_name(), 'error': str(e)}
+                    for student, e in failures
+                ]
+            return Response({
+                'processed_count': len(results),
+                'results': results
+            })
         else:
             return Response({'error': 'student_id ou program_id requis'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -0,0 +1,31 @@
+"""
+Choice labels cached on model classes.
+"""
+
+
+class ChoiceLabelsMixin:
+    """
+    Model mixin serving choice labels from maps built once per class.
+
+    ``get_FOO_display()`` rebuilds a dict from the field's flatchoices on
+    every call. ``choice_labels()`` builds ``{field_name: {value: label}}``
+    on first use (``_meta`` doesn't exist yet when the class body runs) and
+    keeps it on the class; ``choice_label('foo')`` is the cached equivalent
+    of ``get_foo_display()``.
+    """
+
+    @classmethod
+    def choice_labels(cls):
+        labels = cls.__dict__.get('_choice_labels')
+        if labels is None:
+            labels = {
+                field.name: dict(field.flatchoices)
+                for field in cls._meta.concrete_fields
+                if field.choices
+            }
+            cls._choice_labels = labels
+        return labels
+
+    def choice_label(self, field_name):
+        value = getattr(self, field_name)
+        return self.choice_labels()[field_name].get(value, value)
@@ -0,0 +1,22 @@
+"""
+Shared serializer fields.
+"""
+
+from rest_framework import serializers
+
+
+class ChoiceDisplayField(serializers.ReadOnlyField):
+    """
+    Read-only label of a choice value.
+
+    Equivalent to ``source='get_<field>_display'`` but looks the value up in a
+    map built once, instead of rebuilding the model field's choices on every
+    call. Values without a label are returned unchanged, like Django does.
+    """
+
+    def __init__(self, choices, **kwargs):
+        self.labels = dict(choices)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.labels.get(value, value)
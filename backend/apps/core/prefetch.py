@@ -0,0 +1,174 @@
+"""
+Related-object loading planned from serializers.
+
+Serializers declare the relations their fields walk through in their Meta
+(``select_related`` / ``prefetch_related``) and the aggregates they display
+(``annotations``); viewsets using ``SerializerPrefetchMixin`` apply that plan
+to the queryset of the current action, so list and detail endpoints don't
+issue one query per row per FK or per count.
+
+On read requests the mixin also restricts the root model's columns to the
+ones the serializer renders (see ``only_columns``).
+"""
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import SerializerMethodField
+
+
+def _related_columns(model, source_attrs, property_fields):
+    """
+    ``path__column`` names read by a dotted source such as
+    ``student.user.get_full_name``, or None when they can't be known.
+
+    Every step but the last must be a forward FK/one-to-one; the last one a
+    concrete field of the model reached, or a property/method listed in
+    Meta ``property_fields`` under its dotted source.
+    """
+    path = []
+    for attr in source_attrs[:-1]:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            return None
+        path.append(attr)
+        model = field.related_model
+
+    attr = source_attrs[-1]
+    declared = property_fields.get('.'.join(source_attrs))
+    if declared is not None:
+        names = declared
+    else:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+        names = (attr,)
+    prefix = '__'.join(path)
+    return {f'{prefix}__{name}' for name in names}
+
+
+@lru_cache(maxsize=None)
+def only_columns(serializer_class):
+    """
+    Columns of the serializer's model that its fields actually read, or None
+    when every column is needed or the columns can't be known.
+
+    Computed once per serializer class from the fields' first source
+    attribute: concrete fields are kept, relations keep their FK column (the
+    related rows are loaded whole by select_related), Meta ``annotations``
+    need no column. Model properties must be listed in Meta
+    ``property_fields`` with the columns they read; a property that isn't,
+    a SerializerMethodField or a ``source='*'`` field disables the restriction.
+
+    When every dotted source (``student.user.get_full_name``) resolves to
+    columns of the select_related rows, those rows are restricted too
+    (``student__user__first_name``...); methods and properties of related
+    models are listed in ``property_fields`` under their dotted source.
+    Otherwise the related rows are loaded whole.
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return None
+    annotations = getattr(meta, 'annotations', {})
+    property_fields = getattr(meta, 'property_fields', {})
+
+    columns = {model._meta.pk.name}
+    related_columns = set()
+    for field in serializer_class().fields.values():
+        if isinstance(field, SerializerMethodField) or field.source == '*':
+            return None
+        attr = field.source_attrs[0]
+        if related_columns is not None and len(field.source_attrs) > 1:
+            names = _related_columns(model, field.source_attrs, property_fields)
+            if names is None:
+                related_columns = None
+            else:
+                related_columns.update(names)
+        if attr in annotations:
+            continue
+        if attr in property_fields:
+            columns.update(property_fields[attr])
+            continue
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            columns.add(model_field.name)
+
+    select_related = getattr(meta, 'select_related', ())
+    for path in select_related:
+        columns.add(path.split('__')[0])
+
+    # Every FK followed by select_related has to be loaded; columns of
+    # relations that aren't joined are left to their own (lazy) query
+    joined = {
+        '__'.join(steps[:depth])
+        for steps in (path.split('__') for path in select_related)
+        for depth in range(1, len(steps) + 1)
+    }
+    if related_columns is not None and select_related:
+        columns |= {name for name in joined if '__' in name}
+        columns |= {
+            name for name in related_columns
+            if name.rpartition('__')[0] in joined
+        }
+        return tuple(sorted(columns))
+
+    all_columns = {f.name for f in model._meta.concrete_fields}
+    if columns >= all_columns:
+        return None
+    return tuple(sorted(columns))
+
+
+def apply_prefetch(queryset, serializer_class):
+    """
+    Chain the select_related/prefetch_related/annotations declared on a
+    serializer's Meta.
+
+    Serializers without a declaration leave the queryset unchanged.
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    select_related = getattr(meta, 'select_related', ())
+    prefetch_related = getattr(meta, 'prefetch_related', ())
+    annotations = getattr(meta, 'annotations', {})
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if annotations:
+        queryset = queryset.annotate(**annotations)
+    return queryset
+
+
+class SerializerPrefetchMixin:
+    """
+    Apply the related-object graph of the action's serializer class.
+
+    Hooked on filter_queryset so it also covers get_object() and viewsets
+    that override get_queryset() without calling super(). Columns are only
+    trimmed on read requests: a write would save a partially loaded instance.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        queryset = apply_prefetch(queryset, serializer_class)
+        meta = getattr(serializer_class, 'Meta', None)
+        if (
+            self.request.method in SAFE_METHODS
+            and getattr(meta, 'model', None) is queryset.model
+        ):
+            columns = only_columns(serializer_class)
+            if columns:
+                queryset = queryset.only(*columns)
+        return queryset
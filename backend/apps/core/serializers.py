@@ -0,0 +1,28 @@
+"""
+Shared serializer mixins.
+"""
+
+import copy
+
+
+class CachedFieldsMixin:
+    """
+    ModelSerializer mixin building the field declarations once per class.
+
+    ``ModelSerializer.get_fields()`` introspects the model and rebuilds every
+    field each time a serializer is instantiated, i.e. on every request and
+    for every nested/``many`` use. The fields only depend on the class and
+    its Meta, so they are built on first use and kept on the class; each
+    instance gets deep copies, as DRF does for ``_declared_fields``, which
+    ``bind()`` then attaches to it. A shallow copy would share the nested
+    fields, such as ``ManyRelatedField.child_relation``, between instances.
+    Not for serializers whose fields depend on the instance or its context.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get('_cached_fields')
+        if fields is None:
+            fields = super().get_fields()
+            cls._cached_fields = fields
+        return copy.deepcopy(fields)
@@ -25,7 +25,7 @@ class PDFService:
             spaceAfter=20
         )
         elements.append(Paragraph("BULLETIN DE NOTES", title_style))
-        elements.append(Paragraph(f"Semestre: {report_card.semester.get_semester_type_display()} - {report_card.semester.academic_year.name}", styles['Normal']))
+        elements.append(Paragraph(f"Semestre: {report_card.semester.choice_label('semester_type')} - {report_card.semester.academic_year.name}", styles['Normal']))
         elements.append(Spacer(1, 20))
         
         # Student Info
@@ -52,7 +52,7 @@ class PDFService:
         detailed_grades = Grade.objects.filter(
             student=report_card.student, 
             exam__semester=report_card.semester
-        ).select_related('exam')
+        ).select_related('exam').only('score', 'exam__course', 'exam__exam_type')
         
         # Group by course
         grades_by_course = {}
@@ -61,7 +61,7 @@ class PDFService:
             if course_id not in grades_by_course:
                 grades_by_course[course_id] = []
             # Format: "Type: Note"
-            grades_by_course[course_id].append(f"{g.exam.get_exam_type_display()}: {g.score:.2f}")
+            grades_by_course[course_id].append(f"{g.exam.choice_label('exam_type')}: {g.score:.2f}")
 
         from apps.academics.models import CourseGrade
         course_grades = CourseGrade.objects.filter(
@@ -0,0 +1,57 @@
+"""
+Project test runner.
+"""
+
+import os
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from hypothesis import settings as hypothesis_settings
+from hypothesis.database import InMemoryExampleDatabase
+
+# Tests create hundreds of users and never need a slow hash
+TEST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# CI runs start from a fresh checkout: failing examples saved under
+# .hypothesis/ would never be replayed, so keep them in memory
+hypothesis_settings.register_profile(
+    'ci',
+    database=InMemoryExampleDatabase(),
+    max_examples=5,
+    deadline=None,
+)
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """
+    DiscoverRunner spreading test classes over every CPU core by default.
+
+    The test database is migrated once and cloned into each worker, which
+    then runs whole test classes, so class-level fixtures are still built
+    once per class. The SQLite test database lives in memory: there is no
+    schema to keep between runs and ``--keepdb`` has no effect.
+    ``--parallel 1`` runs serially, e.g. for ``--pdb``. Worker failures are
+    pickled back with tblib.
+
+    Passwords are hashed with MD5 for the whole run instead of PBKDF2's
+    hundreds of thousands of rounds per ``create_user``. With ``CI`` set in
+    the environment, Hypothesis runs with the ``ci`` profile.
+    """
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel='auto')
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        if os.environ.get('CI'):
+            hypothesis_settings.load_profile('ci')
+        self._test_settings = override_settings(
+            PASSWORD_HASHERS=TEST_PASSWORD_HASHERS
+        )
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        super().teardown_test_environment(**kwargs)
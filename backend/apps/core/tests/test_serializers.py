@@ -0,0 +1,21 @@
+"""
+Tests for the shared serializer mixins.
+"""
+
+from django.test import SimpleTestCase
+
+from apps.academics.serializers import CourseDetailSerializer
+
+
+class CachedFieldsMixinTests(SimpleTestCase):
+    """Tests for CachedFieldsMixin."""
+
+    def test_instances_do_not_share_nested_fields(self):
+        """Test that many-related fields are bound to their own serializer."""
+        first = CourseDetailSerializer().fields['prerequisites']
+        second = CourseDetailSerializer().fields['prerequisites']
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.child_relation, second.child_relation)
+        self.assertIs(first.child_relation.parent, first)
+        self.assertIs(second.child_relation.parent, second)
@@ -219,7 +219,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         student = self.get_object()
         
         # Get exam grades
-        grades = Grade.objects.filter(student=student).select_related(
+        grades = Grade.objects.filter(student=student).with_percentage().select_related(
             'exam', 'exam__course', 'graded_by'
         )
         
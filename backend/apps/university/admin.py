@@ -34,6 +34,7 @@ class DepartmentAdmin(admin.ModelAdmin):
 @admin.register(Level)
 class LevelAdmin(admin.ModelAdmin):
     list_display = ['name', 'order']
+    search_fields = ['name']
     ordering = ['order']
 
 
@@ -129,11 +129,12 @@ class DashboardView(APIView):
         current_semester = Semester.objects.filter(is_current=True).first()
 
         # Stats
-        credits_validated = 0 # Placeholder logic
         # If we have CourseGrade with is_validated=True
-        validated_grades = CourseGrade.objects.filter(student=student, is_validated=True)
-        for vg in validated_grades:
-            credits_validated += vg.course.credits
+        # Only the credits column is fetched (one query, plain ints, no model instances)
+        credits_validated = sum(
+            CourseGrade.objects.filter(student=student, is_validated=True)
+            .values_list('course_credits', flat=True)
+        )
             
         total_credits = 60 # Assumption for year
         
@@ -146,7 +147,7 @@ class DashboardView(APIView):
         recent_grades = [
             {
                 'course': g.exam.course.name,
-                'type': g.exam.get_exam_type_display(),
+                'type': g.exam.choice_label('exam_type'),
                 'score': g.score,
                 'date': g.date_graded
             }
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 
+from apps.core.choices import ChoiceLabelsMixin
+
 
 class AcademicYear(models.Model):
     """Année académique."""
@@ -24,7 +26,7 @@ class AcademicYear(models.Model):
         super().save(*args, **kwargs)
 
 
-class Semester(models.Model):
+class Semester(ChoiceLabelsMixin, models.Model):
     """Semestre d'une année académique."""
 
     class SemesterType(models.TextChoices):
@@ -53,7 +55,7 @@ class Semester(models.Model):
         ordering = ['academic_year', 'semester_type']
 
     def __str__(self):
-        return f"{self.get_semester_type_display()} - {self.academic_year}"
+        return f"{self.choice_label('semester_type')} - {self.academic_year}"
 
 
 class Faculty(models.Model):
@@ -114,7 +116,7 @@ class Department(models.Model):
         return f"{self.code} - {self.name}"
 
 
-class Level(models.Model):
+class Level(ChoiceLabelsMixin, models.Model):
     """Niveau d'études (L1, L2, L3, M1, M2, etc.)."""
 
     class LevelType(models.TextChoices):
@@ -141,7 +143,7 @@ class Level(models.Model):
         ordering = ['order']
 
     def __str__(self):
-        return self.get_name_display()
+        return self.choice_label('name')
 
 
 class Program(models.Model):
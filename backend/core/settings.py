@@ -106,6 +106,12 @@ MEDIA_ROOT = BASE_DIR / "media"
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Runs test classes in parallel processes unless --parallel 1 is given
+TEST_RUNNER = "apps.core.test_runner.ParallelDiscoverRunner"
+
+# Covering indexes (Index.include) are only created on PostgreSQL
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [